@@ -8,9 +8,13 @@ from PyQt6.QtWidgets import (
     QDoubleSpinBox, QComboBox, QCheckBox, QSlider, QScrollBar,
     QApplication, QMessageBox, QFileDialog
 )
-from PyQt6.QtCore import Qt, QEvent
+from PyQt6.QtCore import Qt, QEvent, QTimer
 from ..utils.merger import RED, BLUE, GREEN, WHITE, YELLOW
 
+# Delay before single-value setting changes are written to disk, so a slider
+# drag or typing in a field ends in one write
+SETTINGS_WRITE_DELAY_MS = 500
+
 # Base class for all tabs
 class BaseTab(QWidget):
     """Base class for tabs with common functionality."""
@@ -927,8 +931,11 @@ class BaseTab(QWidget):
                     settings = json.load(f)
                     if hasattr(self, 'logger'):
                         self.logger.debug("Settings loaded successfully")
-                    # Merge with defaults in case new settings were added
-                    return {**default_settings, **settings}
+                    # Merge with defaults in case new settings were added;
+                    # the defaults are built fresh on each call, so update
+                    # them in place rather than copying into a new dict
+                    default_settings.update(settings)
+                    return default_settings
             else:
                 if hasattr(self, 'logger'):
                     self.logger.info("No settings file found, creating with defaults")
@@ -989,12 +996,39 @@ class BaseTab(QWidget):
                 return
                 
             self.settings[key] = value
-            with open(self.settings_file, 'w', encoding='utf-8') as f:
-                json.dump(self.settings, f, indent=4)
+            self.schedule_settings_write()
             self.logger.debug(f"Saved {key} to settings")
         except Exception as e:
             self.logger.error(f"Error saving {key} to settings: {e}")
 
+    def schedule_settings_write(self):
+        """Write settings to disk after a short delay, collapsing rapid changes into one write."""
+        timer = getattr(self, '_settings_write_timer', None)
+        if timer is None:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(SETTINGS_WRITE_DELAY_MS)
+            timer.timeout.connect(self.flush_settings)
+            self._settings_write_timer = timer
+            # Don't lose a pending write when the application exits
+            app = QApplication.instance()
+            if app:
+                app.aboutToQuit.connect(self.flush_settings)
+        self._settings_dirty = True
+        timer.start()
+
+    def flush_settings(self):
+        """Write pending settings changes to disk now."""
+        if not getattr(self, '_settings_dirty', False):
+            return
+        self._settings_write_timer.stop()
+        self._settings_dirty = False
+        try:
+            with open(self.settings_file, 'w', encoding='utf-8') as f:
+                json.dump(self.settings, f, indent=4)
+        except Exception as e:
+            self.logger.error(f"Error saving settings: {e}")
+
     def save_all_values(self):
         """Save all current values to settings file."""
         try:
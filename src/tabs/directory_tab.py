@@ -24,6 +24,40 @@ from ..utils.merger import Merger, WHITE, YELLOW
 from ..utils.ass_converter import create_ass_from_srt, process_directory as process_ass_directory
 from ..utils.pattern_guesser import suggest_patterns
 
+# Pattern for SxxExx season/episode markers in file names
+_SXXEXX_RE = re.compile(r'[Ss](\d+)[Ee](\d+)')
+# Pattern for a bare episode number used when no configured pattern matches
+_FALLBACK_EP_RE = re.compile(r'(?:^|\s|_|-|\[)(\d{1,2})(?:\s|$|\]|\[|\()')
+
+
+def _find_files(directory, suffix):
+    """Recursively find files ending with suffix, only building Paths for matches."""
+    found = []
+    stack = [str(directory)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.name.endswith(suffix):
+                            found.append(Path(entry.path))
+                    except OSError:
+                        continue
+        except OSError:
+            continue
+    return found
+
+def _list_files(directory, suffix):
+    """List files directly inside directory ending with suffix, without stat calls per entry."""
+    try:
+        with os.scandir(directory) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name.endswith(suffix) and entry.is_file()]
+    except OSError:
+        return []
+
 class DirectoryTab(BaseTab):
     """Tab for processing directories."""
     
@@ -350,11 +384,20 @@ class DirectoryTab(BaseTab):
             sub1_ep_pattern = self.sub1_episode_pattern_entry.text()
             sub2_ep_pattern = self.sub2_episode_pattern_entry.text()
             
-            # Find matching files
-            sub1_files = [f for f in input_path.glob('*.srt') 
-                         if re.search(sub1_pattern, f.name, re.IGNORECASE)]
-            sub2_files = [f for f in input_path.glob('*.srt')
-                         if re.search(sub2_pattern, f.name, re.IGNORECASE)]
+            # Compile the patterns once for every file
+            sub1_re = re.compile(sub1_pattern, re.IGNORECASE)
+            sub2_re = re.compile(sub2_pattern, re.IGNORECASE)
+            sub1_ep_re = re.compile(sub1_ep_pattern)
+            sub2_ep_re = re.compile(sub2_ep_pattern)
+            
+            # Find matching files in a single pass over the directory
+            sub1_files = []
+            sub2_files = []
+            for f in _list_files(input_path, '.srt'):
+                if sub1_re.search(f.name):
+                    sub1_files.append(f)
+                if sub2_re.search(f.name):
+                    sub2_files.append(f)
             
             # Test episode number extraction
             sub1_episodes = []
@@ -362,27 +405,27 @@ class DirectoryTab(BaseTab):
             
             for f in sub1_files[:5]:  # Test first 5 files
                 # First try SxxExx pattern
-                sxxexx_match = re.search(r'[Ss](\d+)[Ee](\d+)', f.stem)
+                sxxexx_match = _SXXEXX_RE.search(f.stem)
                 if sxxexx_match:
                     season_num = sxxexx_match.group(1)
                     ep_num = sxxexx_match.group(2)
                     sub1_episodes.append((f.name, ep_num))
                 else:
                     # Try configured pattern
-                    match = re.search(sub1_ep_pattern, f.stem)
+                    match = sub1_ep_re.search(f.stem)
                     if match:
                         sub1_episodes.append((f.name, match.group(1)))
                     
             for f in sub2_files[:5]:  # Test first 5 files
                 # First try SxxExx pattern
-                sxxexx_match = re.search(r'[Ss](\d+)[Ee](\d+)', f.stem)
+                sxxexx_match = _SXXEXX_RE.search(f.stem)
                 if sxxexx_match:
                     season_num = sxxexx_match.group(1)
                     ep_num = sxxexx_match.group(2)
                     sub2_episodes.append((f.name, ep_num))
                 else:
                     # Try configured pattern
-                    match = re.search(sub2_ep_pattern, f.stem)
+                    match = sub2_ep_re.search(f.stem)
                     if match:
                         sub2_episodes.append((f.name, match.group(1)))
             
@@ -412,22 +455,29 @@ class DirectoryTab(BaseTab):
             self.logger.error(f"Error testing patterns: {e}")
             QMessageBox.critical(self, "Error", f"Error testing patterns: {e}")
     def find_episodes(self, sub_files, sub_ep_pattern, sub_name = 'sub', episode_subs = {}):
+        try:
+            sub_ep_re = re.compile(sub_ep_pattern)
+        except re.error as e:
+            # Keep going with the built-in SxxExx and bare-number matching
+            self.logger.error(f"Invalid episode pattern {sub_ep_pattern}: {e}")
+            sub_ep_re = None
+        
         for sub1 in sub_files:
             try:
                 # First try SxxExx pattern
-                sxxexx_match = re.search(r'[Ss](\d+)[Ee](\d+)', sub1.stem)
+                sxxexx_match = _SXXEXX_RE.search(sub1.stem)
                 if sxxexx_match:
                     season_num = sxxexx_match.group(1)
                     ep_num = sxxexx_match.group(2)
                 else:
                     # Try configured pattern
-                    match = re.search(sub_ep_pattern, sub1.stem)
+                    match = sub_ep_re.search(sub1.stem) if sub_ep_re else None
                     if match:
                         ep_num = match.group(1)
                         season_num = '01'  # Default season
                     else:
                         # Try extracting episode number from filename
-                        ep_match = re.search(r'(?:^|\s|_|-|\[)(\d{1,2})(?:\s|$|\]|\[|\()', sub1.stem)
+                        ep_match = _FALLBACK_EP_RE.search(sub1.stem)
                         if ep_match:
                             ep_num = ep_match.group(1)
                             season_num = '01'  # Default season
@@ -445,7 +495,7 @@ class DirectoryTab(BaseTab):
                         'episode': ep_num,
                         'file_name': sub1.name
                     }
-                    self.logger.debug(f"Found sub1 for {ep_key}: {sub1.name}")
+                    self.logger.debug("Found sub1 for %s: %s", ep_key, sub1.name)
                 elif sub_name != 'sub1' or sub_name != 'sub':
                     episode_subs[ep_key][sub_name] = sub1
                     
@@ -475,33 +525,38 @@ class DirectoryTab(BaseTab):
                 input_path = Path(input_dir)
                 video_path = Path(video_dir)
                 
-                # List all srt files for logging
-                all_srt_files = list(input_path.glob('*.srt'))
-                self.logger.debug(f"Found {len(all_srt_files)} total .srt files")
-                for srt_file in all_srt_files:
-                    self.logger.debug(f"Found SRT file: {srt_file.name}")
-                
                 # Get current patterns from UI
                 sub1_pattern = self.sub1_pattern_entry.text()
                 sub2_pattern = self.sub2_pattern_entry.text()
                 sub1_ep_pattern = self.sub1_episode_pattern_entry.text()
                 sub2_ep_pattern = self.sub2_episode_pattern_entry.text()
                 
-                # Find matching files using the same logic as test_patterns
-                sub1_files = [f for f in input_path.glob('*.srt') 
-                            if re.search(sub1_pattern, f.name, re.IGNORECASE)]
-                sub2_files = [f for f in input_path.glob('*.srt')
-                            if re.search(sub2_pattern, f.name, re.IGNORECASE)]
+                # Find matching files using the same logic as test_patterns,
+                # listing and classifying the srt files in one pass
+                sub1_re = re.compile(sub1_pattern, re.IGNORECASE)
+                sub2_re = re.compile(sub2_pattern, re.IGNORECASE)
+                srt_count = 0
+                sub1_files = []
+                sub2_files = []
+                for srt_file in _list_files(input_path, '.srt'):
+                    srt_count += 1
+                    self.logger.debug("Found SRT file: %s", srt_file.name)
+                    if sub1_re.search(srt_file.name):
+                        sub1_files.append(srt_file)
+                    if sub2_re.search(srt_file.name):
+                        sub2_files.append(srt_file)
+                self.logger.debug("Found %d total .srt files", srt_count)
                 
                 self.logger.info(f"Found {len(sub1_files)} sub1 files and {len(sub2_files)} sub2 files")
                 
                 # Log matched files
-                self.logger.debug("Sub1 matched files:")
-                for f in sub1_files:
-                    self.logger.debug(f"  - {f.name}")
-                self.logger.debug("Sub2 matched files:")
-                for f in sub2_files:
-                    self.logger.debug(f"  - {f.name}")
+                if self.logger.isEnabledFor(logging.DEBUG):
+                    self.logger.debug("Sub1 matched files:")
+                    for f in sub1_files:
+                        self.logger.debug("  - %s", f.name)
+                    self.logger.debug("Sub2 matched files:")
+                    for f in sub2_files:
+                        self.logger.debug("  - %s", f.name)
                 
             except Exception as e:
                 self.logger.error(f"Error finding subtitle files: {e}")
@@ -562,10 +617,11 @@ class DirectoryTab(BaseTab):
                     matched_pairs = [k for k, v in episode_subs.items() if 'sub1' in v and 'sub2' in v]
 
             self.logger.info(f"Found {len(matched_pairs)} matched subtitle pairs")
-            for pair in matched_pairs:
-                sub1_name = episode_subs[pair]['sub1'].name
-                sub2_name = episode_subs[pair]['sub2'].name if 'sub2' in episode_subs[pair] else "None"
-                self.logger.debug(f"Matched pair for {pair}: sub1={sub1_name}, sub2={sub2_name}")
+            if self.logger.isEnabledFor(logging.DEBUG):
+                for pair in matched_pairs:
+                    sub1_name = episode_subs[pair]['sub1'].name
+                    sub2_name = episode_subs[pair]['sub2'].name if 'sub2' in episode_subs[pair] else "None"
+                    self.logger.debug("Matched pair for %s: sub1=%s, sub2=%s", pair, sub1_name, sub2_name)
 
             if not matched_pairs:
                 self.logger.error("No matched subtitle pairs found. Check your patterns or try automatic detection.")
@@ -574,21 +630,21 @@ class DirectoryTab(BaseTab):
                 return
 
             # Find and process video files - only look for MKV files
-            video_files = [f for f in Path(video_dir).glob('**/*.mkv')]
+            video_files = _find_files(video_dir, '.mkv')
             
             self.logger.info(f"Found {len(video_files)} video files")
 
             # Process each video file
             video_eps = self.find_episodes(video_files, sub2_ep_pattern)
+            # Map each video file name to the first episode key found for it
+            video_ep_keys = {}
+            for key, value in video_eps.items():
+                video_ep_keys.setdefault(value['file_name'], key)
             for video_file in video_files:
-                self.logger.debug(f"Found video file: {video_file.name}")
+                self.logger.debug("Found video file: %s", video_file.name)
                 try:
-                    ep_key = ''
-                    for key, value in video_eps.items():
-                        if value['file_name'] == video_file.name:
-                            ep_key = key
-                            break
-                    self.logger.debug(f"Extracted {ep_key} from {video_file.name}")
+                    ep_key = video_ep_keys.get(video_file.name, '')
+                    self.logger.debug("Extracted %s from %s", ep_key, video_file.name)
                     
                     if ep_key not in episode_subs:
                         self.logger.warning(f"No subtitles found for {ep_key}")
@@ -604,7 +660,7 @@ class DirectoryTab(BaseTab):
                         self.logger.warning(f"Missing sub1 for {ep_key}")
                         continue
                     
-                    self.logger.debug(f"Processing {ep_key} with sub1={sub1_file.name}, sub2={sub2_file.name}")
+                    self.logger.debug("Processing %s with sub1=%s, sub2=%s", ep_key, sub1_file.name, sub2_file.name)
                     
                     # Copy subtitle files next to video with consistent naming
                     try:
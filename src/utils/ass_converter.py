@@ -10,6 +10,7 @@ used in professional anime subtitles with precise positioning and styling.
 import os
 import re
 import logging
+from functools import lru_cache
 from pathlib import Path
 import pysubs2
 from .furigana_generator import FuriganaGenerator
@@ -33,6 +34,8 @@ BASE_X = 960  # Center of 1920 width
 BASE_Y_BOTTOM = 1011  # Bottom line position from example.ass
 BASE_Y_TOP = 933  # Adjusted from 903 to bring furigana closer to main text
 RUBY_Y_OFFSET = -35  # Adjusted from -47 to bring furigana closer
+UNDERLINE_Y_TOP = BASE_Y_TOP + 45  # Top edge of the furigana underline
+UNDERLINE_Y_BOTTOM = BASE_Y_TOP + 47  # Bottom edge of the furigana underline
 
 # Color mapping for common colors (matching example.ass)
 COLOR_MAP = {
@@ -71,12 +74,67 @@ COLOR_MAP = {
     "navy": "&H800000&",       # 紺青 (Konjo)
 }
 
-# Initialize the furigana generator
-furigana_generator = FuriganaGenerator()
+# Underline drawing for kanji with furigana; only the corner coordinates vary
+_UNDERLINE_TEMPLATE = "{\\pos(0,0)}{\\c&H4E4EF1&}{\\p1}m %d %d l %d %d %d %d %d %d{\\p0}{\\c}"
 
+# Pattern for HTML font color tags
+_FONT_TAG_RE = re.compile(r'<font color="([^"]+)">(.*?)</font>')
+
+# Pattern for any HTML tag (stripped before measuring text width)
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+
+# Pattern for an ASS color override tag, e.g. \c&H0000FF&
+_ASS_COLOR_TAG_RE = re.compile(r'\\c(&H[0-9A-F]+&)')
+
+# Pattern for kanji followed by furigana in parentheses, e.g. 漢字(かんじ)
+_KANJI_FURIGANA_RE = re.compile(r'([一-龯々]+)\(([ぁ-ゔァ-ヴー]+)\)')
+
+# Pattern matching either a font color tag or a kanji with furigana, so both
+# can be found in a single scan
+_FURIGANA_SCAN_RE = re.compile(
+    r'(?P<font><font color="(?P<color>[^"]+)">(?P<content>.*?)</font>)'
+    r'|(?P<kanji>[一-龯々]+)\((?P<furigana>[ぁ-ゔァ-ヴー]+)\)'
+)
+
+# Patterns for any text followed by furigana in parentheses, e.g. 漢字(かんじ),
+# or in curly braces as produced by the furigana generator, e.g. 漢字{かんじ}
+_PAREN_RUBY_RE = re.compile(r'(\S+?)\(([^)]+)\)')
+_BRACE_RUBY_RE = re.compile(r'(\S+?)\{([^}]+)\}')
+
+# Pattern for CJK characters and full-width forms (code points >= U+3000)
+_WIDE_CHAR_RE = re.compile('[\u3000-\U0010FFFF]')
+
+# Patterns used to prepare SRT cue text the same way pysubs2 does
+_SRT_INDEX_LINE_RE = re.compile(r'\s*\d+\s*$')
+_SRT_NEXT_INDEX_RE = re.compile(r'\n+ *\d+ *$')
+_SRT_OTHER_TAG_RE = re.compile(r'< */? *[a-zA-Z][^>]*>')
+_SRT_STYLE_TAGS = [
+    (re.compile(r'< *i *>'), r'{\\i1}'),
+    (re.compile(r'< */ *i *>'), r'{\\i0}'),
+    (re.compile(r'< *s *>'), r'{\\s1}'),
+    (re.compile(r'< */ *s *>'), r'{\\s0}'),
+    (re.compile(r'< *u *>'), r'{\\u1}'),
+    (re.compile(r'< */ *u *>'), r'{\\u0}'),
+    (re.compile(r'< *b *>'), r'{\\b1}'),
+    (re.compile(r'< */ *b *>'), r'{\\b0}'),
+]
+
+# Furigana generator, created on first use since it loads a dictionary
+_furigana_generator = None
+
+def _get_furigana_generator():
+    """Return the shared FuriganaGenerator, creating it on first use."""
+    global _furigana_generator
+    if _furigana_generator is None:
+        _furigana_generator = FuriganaGenerator()
+    return _furigana_generator
+
+@lru_cache(maxsize=256)
 def convert_html_to_ass_color(color):
     """Convert HTML color to ASS color format.
     
+    Subtitles reuse a handful of colors, so results are cached.
+    
     Args:
         color (str): HTML color in format '#RRGGBB' or color name
         
@@ -84,17 +142,60 @@ def convert_html_to_ass_color(color):
         str: ASS color in format '&HBBGGRR&'
     """
     if color.startswith('#'):
-        # Convert hex color to ASS format (BGR)
-        r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+        # Convert hex color to ASS format (BGR), parsing the three channel
+        # bytes in one call
+        r, g, b = bytes.fromhex(color[1:7])
         return f"&H{b:02X}{g:02X}{r:02X}&"
     else:
         # Map common color names to ASS colors
         return COLOR_MAP.get(color.lower(), DEFAULT_TEXT_COLOR)
 
+def _extract_kanji_pairs(text, ass_color=None):
+    """
+    Extract pairs of base text and furigana from text without color tags.
+    
+    Args:
+        text (str): Text containing no HTML font color tags
+        ass_color (str, optional): ASS color applied to kanji, or to the whole
+            text when it has no kanji with furigana
+        
+    Returns:
+        list: List of tuples (base_text, furigana, is_kanji)
+    """
+    pairs = []
+    last_end = 0
+    
+    for match in _KANJI_FURIGANA_RE.finditer(text):
+        # Add any text before the kanji
+        if match.start() > last_end:
+            pairs.append((text[last_end:match.start()], None, False))
+        
+        # Add the kanji with furigana (and color, if any)
+        kanji = match.group(1)
+        furigana = match.group(2)
+        if ass_color:
+            kanji = f"{{\\c{ass_color}}}{kanji}{{\\c}}"
+        pairs.append((kanji, furigana, True))
+        
+        last_end = match.end()
+    
+    if not pairs:
+        # No kanji found, treat the entire text as a single pair (with color, if any)
+        if ass_color:
+            text = f"{{\\c{ass_color}}}{text}{{\\c}}"
+        pairs.append((text, None, False))
+    elif last_end < len(text):
+        # Add any remaining text after the last kanji
+        pairs.append((text[last_end:], None, False))
+    
+    return pairs
+
 def extract_furigana_pairs(text, auto_generate=False):
     """
     Extract pairs of base text and furigana.
     
+    Color tags and kanji with furigana are found in a single scan of the text.
+    
     Args:
         text (str): Original text
         auto_generate (bool): Whether to use automatic furigana generation
@@ -103,94 +204,97 @@ def extract_furigana_pairs(text, auto_generate=False):
         list: List of tuples (base_text, furigana, is_kanji)
     """
     pairs = []
+    last_end = 0
     
-    # Process color tags first
-    color_matches = list(re.finditer(r'<font color="([^"]+)">(.*?)</font>', text))
-    if color_matches:
-        last_end = 0
-        for match in color_matches:
-            # Add any text before the color tag
-            if match.start() > last_end:
-                prefix = text[last_end:match.start()]
-                if prefix:
-                    prefix_pairs = extract_furigana_pairs(prefix, auto_generate)
-                    pairs.extend(prefix_pairs)
-            
-            # Get the color and content
-            color = match.group(1)
-            content = match.group(2)
-            
-            # Convert color to ASS format
-            ass_color = convert_html_to_ass_color(color)
-            
+    for match in _FURIGANA_SCAN_RE.finditer(text):
+        # Add any text before the color tag or kanji
+        if match.start() > last_end:
+            pairs.append((text[last_end:match.start()], None, False))
+        
+        if match.group('font'):
             # Process the content within the color tag
-            # Find kanji with furigana in parentheses
-            kanji_matches = list(re.finditer(r'([一-龯々]+)\(([ぁ-ゔァ-ヴー]+)\)', content))
-            
-            if kanji_matches:
-                last_kanji_end = 0
-                for kanji_match in kanji_matches:
-                    # Add any text before the kanji
-                    if kanji_match.start() > last_kanji_end:
-                        non_kanji = content[last_kanji_end:kanji_match.start()]
-                        if non_kanji:
-                            pairs.append((non_kanji, None, False))
-                    
-                    # Add the kanji with furigana and color
-                    kanji = kanji_match.group(1)
-                    furigana = kanji_match.group(2)
-                    pairs.append((f"{{\\c{ass_color}}}{kanji}{{\\c}}", furigana, True))
-                    
-                    last_kanji_end = kanji_match.end()
-                
-                # Add any remaining text after the last kanji
-                if last_kanji_end < len(content):
-                    remaining = content[last_kanji_end:]
-                    if remaining:
-                        pairs.append((remaining, None, False))
-            else:
-                # No kanji found, treat the entire content as a single pair with color
-                pairs.append((f"{{\\c{ass_color}}}{content}{{\\c}}", None, False))
-            
-            last_end = match.end()
-        
-        # Add any remaining text after the last color tag
-        if last_end < len(text):
-            suffix = text[last_end:]
-            if suffix:
-                suffix_pairs = extract_furigana_pairs(suffix, auto_generate)
-                pairs.extend(suffix_pairs)
-    else:
-        # No color tags found, process as normal text
-        kanji_matches = list(re.finditer(r'([一-龯々]+)\(([ぁ-ゔァ-ヴー]+)\)', text))
-        
-        if kanji_matches:
-            last_end = 0
-            for match in kanji_matches:
-                # Add any text before the kanji
-                if match.start() > last_end:
-                    non_kanji = text[last_end:match.start()]
-                    if non_kanji:
-                        pairs.append((non_kanji, None, False))
-                
-                # Add the kanji with furigana
-                kanji = match.group(1)
-                furigana = match.group(2)
-                pairs.append((kanji, furigana, True))
-                
-                last_end = match.end()
-            
-            # Add any remaining text after the last kanji
-            if last_end < len(text):
-                remaining = text[last_end:]
-                if remaining:
-                    pairs.append((remaining, None, False))
+            ass_color = convert_html_to_ass_color(match.group('color'))
+            pairs.extend(_extract_kanji_pairs(match.group('content'), ass_color))
         else:
-            # No kanji found, treat the entire text as a single pair
-            pairs.append((text, None, False))
+            # Add the kanji with furigana
+            pairs.append((match.group('kanji'), match.group('furigana'), True))
+        
+        last_end = match.end()
+    
+    if not pairs:
+        # No color tags or kanji found, treat the entire text as a single pair
+        pairs.append((text, None, False))
+    elif last_end < len(text):
+        # Add any remaining text after the last match
+        pairs.append((text[last_end:], None, False))
     
     return pairs
 
+def _ms_to_ass_timestamp(ms):
+    """Convert milliseconds to an ASS timestamp ('H:MM:SS.cc'), rounded to centiseconds."""
+    cs = (max(ms, 0) + 5) // 10
+    h, cs = divmod(cs, 360000)
+    m, cs = divmod(cs, 6000)
+    s, cs = divmod(cs, 100)
+    return f"{h:d}:{m:02d}:{s:02d}.{cs:02d}"
+
+def _format_dialogue(layer, start, end, style, text):
+    """Format a single ASS Dialogue line from pre-formatted timestamps."""
+    return f"Dialogue: {layer},{start},{end},{style},,0,0,0,,{text}\n"
+
+def _prepare_srt_text(lines):
+    """
+    Turn the raw lines of an SRT cue into ASS event text.
+    
+    Mirrors how pysubs2 loads SRT files: supported HTML tags become ASS
+    override tags, other HTML tags are stripped and newlines become \\N.
+    
+    Args:
+        lines (list): Lines following the cue's timestamp line
+        
+    Returns:
+        str: ASS event text
+    """
+    # Timestamp line followed only by blank lines and the next cue's index
+    if (len(lines) >= 2
+            and all(not line.strip() for line in lines[:-1])
+            and _SRT_INDEX_LINE_RE.match(lines[-1])):
+        return ""
+    
+    text = "".join(lines).strip()
+    text = _SRT_NEXT_INDEX_RE.sub("", text)
+    for pattern, replacement in _SRT_STYLE_TAGS:
+        text = pattern.sub(replacement, text)
+    text = _SRT_OTHER_TAG_RE.sub("", text)
+    return text.replace("\n", "\\N")
+
+def _iter_srt_cues(srt_path, encoding="utf-8"):
+    """
+    Read an SRT file one cue at a time instead of loading it whole.
+    
+    Args:
+        srt_path (str): Path to the SRT file
+        encoding (str): Encoding of the SRT file
+        
+    Yields:
+        tuple: (start_ms, end_ms, text) for each cue
+    """
+    timing = None
+    lines = []
+    with open(srt_path, encoding=encoding) as f:
+        for line in f:
+            stamps = pysubs2.time.TIMESTAMP.findall(line)
+            if len(stamps) == 2:
+                if timing is not None:
+                    yield timing[0], timing[1], _prepare_srt_text(lines)
+                timing = tuple(pysubs2.time.timestamp_to_ms(stamp) for stamp in stamps)
+                lines = []
+            elif timing is not None:
+                lines.append(line)
+    
+    if timing is not None:
+        yield timing[0], timing[1], _prepare_srt_text(lines)
+
 def create_advanced_ass_from_srt(
     srt_file_path, 
     output_dir=None,
@@ -229,7 +333,7 @@ def create_advanced_ass_from_srt(
         str: Path to the created ASS file
     """
     try:
-        logger.debug(f"Starting conversion of {srt_file_path} to ASS format")
+        logger.debug("Starting conversion of %s to ASS format", srt_file_path)
         
         # Convert colors to ASS format if they're in HTML format
         text_color = convert_html_to_ass_color(text_color)
@@ -252,11 +356,8 @@ def create_advanced_ass_from_srt(
         # Determine output filename
         output_file = output_dir / f"{srt_path.stem}.ass"
         
-        # Load the SRT file
-        logger.debug(f"Loading SRT file: {srt_path}")
-        subs = pysubs2.load(str(srt_path), encoding="utf-8")
-        
-        # Create a new ASS file
+        # Create a new ASS file (only used for the header and styles, events
+        # are written straight to the output file as the SRT is read)
         ass_subs = pysubs2.SSAFile()
         
         # Script info section
@@ -340,24 +441,18 @@ def create_advanced_ass_from_srt(
             'SPACE': 0.5     # Space
         }
         
-        # Function to estimate character width based on character type
-        def estimate_char_width(char, base_width):
-            if ord(char) >= 0x3000:  # CJK characters and full-width forms
-                return base_width * CHAR_WIDTH_RATIO['CJK']
-            elif char.isalpha():     # Latin alphabet
-                return base_width * CHAR_WIDTH_RATIO['LATIN']
-            elif char.isdigit():     # Digits
-                return base_width * CHAR_WIDTH_RATIO['DIGIT']
-            elif char.isspace():     # Spaces
-                return base_width * CHAR_WIDTH_RATIO['SPACE']
-            else:                    # Punctuation and others
-                return base_width * CHAR_WIDTH_RATIO['PUNCT']
-        
         # Function to calculate text width
         def calculate_text_width(text, char_base_width):
             # Remove HTML tags for width calculation
-            clean_text = re.sub(r'<[^>]+>', '', text)
-            return sum(estimate_char_width(char, char_base_width) for char in clean_text)
+            clean_text = _HTML_TAG_RE.sub('', text)
+            # Every non-CJK class shares the half-width ratio, so only the
+            # number of full-width characters needs to be counted
+            wide_count = len(_WIDE_CHAR_RE.findall(clean_text))
+            narrow_count = len(clean_text) - wide_count
+            return char_base_width * (
+                wide_count * CHAR_WIDTH_RATIO['CJK'] +
+                narrow_count * CHAR_WIDTH_RATIO['LATIN']
+            )
         
         # Spacing constants
         CHAR_BASE_WIDTH = font_size * 0.8  # Base width for character sizing
@@ -366,112 +461,111 @@ def create_advanced_ass_from_srt(
         RUBY_SPACING = ruby_font_size * 0.2  # Space between ruby characters
         VERTICAL_SPACING = font_size * 1.5  # Vertical spacing between lines
         
-        # Process each subtitle
-        for sub in subs:
-            logger.debug(f"Processing subtitle: {sub.text}")
-            
-            # Extract furigana pairs from the text
-            pairs = extract_furigana_pairs(sub.text, auto_generate_furigana)
-            logger.debug(f"Extracted pairs: {pairs}")
-            
-            # Calculate total width for centering
-            total_width = 0
-            for base, furigana, _ in pairs:
-                base_width = calculate_text_width(base, CHAR_BASE_WIDTH)
-                furigana_width = calculate_text_width(furigana, RUBY_BASE_WIDTH) if furigana else 0
-                # Use the wider of the two for positioning
-                segment_width = max(base_width, furigana_width)
-                total_width += segment_width + CHAR_SPACING
-            
-            # Initial position (centered)
-            current_x = BASE_X - (total_width / 2)
-            
-            # Layer settings
-            layer = 0  # Base layer
-            ruby_layer = 2  # Ruby text layer
-            underline_layer = 1  # Underline layer
-            
-            # Process each pair
-            for i, (base, furigana, is_kanji) in enumerate(pairs):
-                # Calculate width of this text segment
-                base_width = calculate_text_width(base, CHAR_BASE_WIDTH)
-                furigana_width = calculate_text_width(furigana, RUBY_BASE_WIDTH) if furigana else 0
-                
-                # Use the wider of the two for positioning
-                segment_width = max(base_width, furigana_width)
-                
-                # Calculate center position for this segment
-                segment_center_x = current_x + (segment_width / 2)
-                
-                # Add main text dialogue
-                pos_tag_main = f"{{\\pos({int(segment_center_x)},{BASE_Y_BOTTOM})}}"
-                
-                # The base text already contains color tags from extract_furigana_pairs
-                main_dialogue = pysubs2.SSAEvent(
-                    start=sub.start,
-                    end=sub.end,
-                    style="Default",
-                    layer=layer,
-                    text=pos_tag_main + base
-                )
-                ass_subs.events.append(main_dialogue)
-                logger.debug(f"Added main dialogue: {main_dialogue.text}")
+        # Layer settings
+        layer = 0  # Base layer
+        ruby_layer = 2  # Ruby text layer
+        underline_layer = 1  # Underline layer
+        
+        # Default ruby color, shared by all subtitles
+        default_ruby_color_ass = convert_html_to_ass_color(ruby_color)
+        
+        # Position of a subtitle made of a single plain segment
+        plain_pos_tag = f"{{\\pos({int(BASE_X - CHAR_SPACING / 2)},{BASE_Y_BOTTOM})}}"
+        
+        # Write the script info and styles, then stream events after them into
+        # a temporary file next to the output, so a failure partway through the
+        # SRT leaves any existing output untouched
+        logger.debug("Streaming SRT file %s to %s", srt_path, output_file)
+        tmp_file = output_file.with_name(output_file.name + ".tmp")
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as out:
+                out.write(ass_subs.to_string("ass"))
                 
-                # Add ruby text if present
-                if furigana:
-                    # Center ruby text above the base text
-                    ruby_center_x = segment_center_x
-                    pos_tag_ruby = f"{{\\pos({int(ruby_center_x)},{BASE_Y_TOP})}}"
+                # Process each subtitle
+                for start_ms, end_ms, sub_text in _iter_srt_cues(srt_path):
+                    logger.debug("Processing subtitle: %s", sub_text)
+                    start = _ms_to_ass_timestamp(start_ms)
+                    end = _ms_to_ass_timestamp(end_ms)
                     
-                    # Extract color from base text if it has a color tag
-                    color_match = re.search(r'\\c(&H[0-9A-F]+&)', base)
-                    if color_match:
-                        ass_color = color_match.group(1)
-                        processed_ruby = f"{{\\c{ass_color}}}{furigana}{{\\c}}"
-                    else:
-                        # Apply default ruby color
-                        ass_color = convert_html_to_ass_color(ruby_color)
-                        processed_ruby = f"{{\\c{ass_color}}}{furigana}{{\\c}}"
+                    # Fast path: no color tags or furigana, so the whole text is one segment
+                    if '(' not in sub_text and '<font' not in sub_text:
+                        out.write(_format_dialogue(layer, start, end, "Default", plain_pos_tag + sub_text))
+                        continue
                     
-                    ruby_dialogue = pysubs2.SSAEvent(
-                        start=sub.start,
-                        end=sub.end,
-                        style="Ruby",
-                        layer=ruby_layer,
-                        text=pos_tag_ruby + processed_ruby
-                    )
-                    ass_subs.events.append(ruby_dialogue)
-                    logger.debug(f"Added ruby dialogue: {ruby_dialogue.text}")
+                    # Extract furigana pairs from the text
+                    pairs = extract_furigana_pairs(sub_text, auto_generate_furigana)
+                    logger.debug("Extracted pairs: %s", pairs)
                     
-                    # Add underline for kanji with furigana
-                    # Calculate underline width based on the base text width
-                    underline_width = base_width
-                    underline_left = segment_center_x - (underline_width / 2)
-                    underline_right = segment_center_x + (underline_width / 2)
+                    # Calculate segment widths once, using the wider of base and furigana
+                    base_widths = [calculate_text_width(base, CHAR_BASE_WIDTH) for base, _, _ in pairs]
+                    segment_widths = [
+                        max(base_width, calculate_text_width(furigana, RUBY_BASE_WIDTH) if furigana else 0)
+                        for base_width, (_, furigana, _) in zip(base_widths, pairs)
+                    ]
                     
-                    pos_tag = "{\\pos(0,0)}"
-                    color_tag = "{\\c&H4E4EF1&}"
-                    p1_tag = "{\\p1}"
-                    p0_tag = "{\\p0}"
-                    c_tag = "{\\c}"
+                    # Calculate total width for centering, adding left to right so
+                    # rounded positions match the per-segment accumulation below
+                    total_width = 0
+                    for segment_width in segment_widths:
+                        total_width += segment_width + CHAR_SPACING
                     
-                    # Create underline with drawing commands
-                    underline_dialogue = pysubs2.SSAEvent(
-                        start=sub.start,
-                        end=sub.end,
-                        style="Underline",
-                        layer=underline_layer,
-                        text=f"{pos_tag}{color_tag}{p1_tag}m {int(underline_left)} {BASE_Y_TOP + 45} l {int(underline_right)} {BASE_Y_TOP + 45} {int(underline_right)} {BASE_Y_TOP + 47} {int(underline_left)} {BASE_Y_TOP + 47}{p0_tag}{c_tag}"
-                    )
-                    ass_subs.events.append(underline_dialogue)
-                    logger.debug(f"Added underline dialogue: {underline_dialogue.text}")
-                
-                # Move to the next position with proper spacing
-                current_x += segment_width + CHAR_SPACING
-        
-        # Save as ASS file
-        logger.debug(f"Saving ASS file to {output_file}")
-        ass_subs.save(str(output_file))
+                    # Initial position (centered)
+                    current_x = BASE_X - (total_width / 2)
+                    
+                    # Process each pair
+                    for (base, furigana, is_kanji), base_width, segment_width in zip(pairs, base_widths, segment_widths):
+                        # Calculate center position for this segment
+                        segment_center_x = current_x + (segment_width / 2)
+                        
+                        # Add main text dialogue
+                        pos_tag_main = f"{{\\pos({int(segment_center_x)},{BASE_Y_BOTTOM})}}"
+                        
+                        # The base text already contains color tags from extract_furigana_pairs
+                        main_text = pos_tag_main + base
+                        out.write(_format_dialogue(layer, start, end, "Default", main_text))
+                        logger.debug("Added main dialogue: %s", main_text)
+                        
+                        # Add ruby text if present
+                        if furigana:
+                            # Center ruby text above the base text
+                            ruby_center_x = segment_center_x
+                            pos_tag_ruby = f"{{\\pos({int(ruby_center_x)},{BASE_Y_TOP})}}"
+                            
+                            # Extract color from base text if it has a color tag
+                            color_match = _ASS_COLOR_TAG_RE.search(base)
+                            if color_match:
+                                ass_color = color_match.group(1)
+                            else:
+                                # Apply default ruby color
+                                ass_color = default_ruby_color_ass
+                            processed_ruby = f"{{\\c{ass_color}}}{furigana}{{\\c}}"
+                            
+                            ruby_text = pos_tag_ruby + processed_ruby
+                            out.write(_format_dialogue(ruby_layer, start, end, "Ruby", ruby_text))
+                            logger.debug("Added ruby dialogue: %s", ruby_text)
+                            
+                            # Add underline for kanji with furigana
+                            # Calculate underline width based on the base text width
+                            underline_width = base_width
+                            underline_left = segment_center_x - (underline_width / 2)
+                            underline_right = segment_center_x + (underline_width / 2)
+                            ul = int(underline_left)
+                            ur = int(underline_right)
+                            
+                            # Create underline with drawing commands
+                            underline_text = _UNDERLINE_TEMPLATE % (
+                                ul, UNDERLINE_Y_TOP, ur, UNDERLINE_Y_TOP,
+                                ur, UNDERLINE_Y_BOTTOM, ul, UNDERLINE_Y_BOTTOM
+                            )
+                            out.write(_format_dialogue(underline_layer, start, end, "Underline", underline_text))
+                            logger.debug("Added underline dialogue: %s", underline_text)
+                        
+                        # Move to the next position with proper spacing
+                        current_x += segment_width + CHAR_SPACING
+        except Exception:
+            tmp_file.unlink(missing_ok=True)
+            raise
+        os.replace(tmp_file, output_file)
         
         return str(output_file)
         
@@ -588,7 +682,7 @@ def create_ass_from_srt(
         for line in subs:
             if auto_generate_furigana:
                 # Use the furigana generator to add furigana
-                text_with_furigana = furigana_generator.generate(line.text)
+                text_with_furigana = _get_furigana_generator().generate(line.text)
                 # Convert the generated format to ASS format
                 line.text = convert_furigana_format_to_ass(text_with_furigana)
             else:
@@ -604,6 +698,12 @@ def create_ass_from_srt(
         print(f"Error converting {srt_file_path} to ASS: {e}")
         raise
 
+def _replace_with_ruby(match):
+    """Replace a base text and furigana match with ASS ruby tags."""
+    base = match.group(1)  # The kanji/base text
+    ruby = match.group(2)  # The furigana/ruby text
+    return f"{{\\k0}}{base}{{\\rt({ruby})}}"
+
 def add_ruby_tags(text):
     """
     Convert text with furigana in parentheses to ASS ruby format.
@@ -617,16 +717,8 @@ def add_ruby_tags(text):
     Returns:
         str: Text with ASS ruby tags
     """
-    def replace_with_ruby(match):
-        base = match.group(1)  # The kanji/base text
-        ruby = match.group(2)  # The furigana/ruby text
-        return f"{{\\k0}}{base}{{\\rt({ruby})}}"
-    
-    # Pattern to match text with furigana in parentheses
-    pattern = r'(\S+?)\(([^)]+)\)'
-    
     # Replace all occurrences
-    return re.sub(pattern, replace_with_ruby, text)
+    return _PAREN_RUBY_RE.sub(_replace_with_ruby, text)
 
 def convert_furigana_format_to_ass(text):
     """
@@ -641,16 +733,8 @@ def convert_furigana_format_to_ass(text):
     Returns:
         str: Text with ASS ruby tags
     """
-    def replace_with_ruby(match):
-        base = match.group(1)  # The kanji/base text
-        ruby = match.group(2)  # The furigana/ruby text
-        return f"{{\\k0}}{base}{{\\rt({ruby})}}"
-    
-    # Pattern to match text with furigana in curly braces
-    pattern = r'(\S+?)\{([^}]+)\}'
-    
     # Replace all occurrences
-    return re.sub(pattern, replace_with_ruby, text)
+    return _BRACE_RUBY_RE.sub(_replace_with_ruby, text)
 
 def process_color_tags(text, default_color=DEFAULT_TEXT_COLOR):
     """Process HTML font color tags in text and convert to ASS color tags.
@@ -662,28 +746,15 @@ def process_color_tags(text, default_color=DEFAULT_TEXT_COLOR):
     Returns:
         str: Text with ASS color tags
     """
-    processed_text = text
+    def replace_color_tag(match):
+        ass_color = convert_html_to_ass_color(match.group(1))
+        return f"{{\\c{ass_color}}}{match.group(2)}{{\\c}}"
     
-    # Find all color tags
-    color_matches = list(re.finditer(r'<font color="([^"]+)">(.*?)</font>', processed_text))
-    
-    # Process each match from end to beginning to avoid index issues
-    for match in reversed(color_matches):
-        color = match.group(1)
-        content = match.group(2)
-        
-        # Convert color to ASS format
-        ass_color = convert_html_to_ass_color(color)
-        
-        # Replace HTML tag with ASS color tag
-        processed_text = (
-            processed_text[:match.start()] +
-            f"{{\\c{ass_color}}}{content}{{\\c}}" +
-            processed_text[match.end():]
-        )
+    # Replace all color tags in a single pass
+    processed_text, count = _FONT_TAG_RE.subn(replace_color_tag, text)
     
     # If no color tags found and text is not empty, apply default color
-    if not color_matches and processed_text.strip():
+    if not count and processed_text.strip():
         ass_color = convert_html_to_ass_color(default_color)
         processed_text = f"{{\\c{ass_color}}}{processed_text}{{\\c}}"
     
@@ -716,8 +787,14 @@ def process_directory(
     else:
         output_dir = Path(output_dir)
         
-    # Find all SRT files
-    srt_files = list(input_path.glob("*.srt"))
+    # Find all SRT files, filtering directory entries by name so no entry
+    # needs a stat call
+    try:
+        with os.scandir(input_path) as entries:
+            srt_files = [Path(entry.path) for entry in entries
+                         if entry.name.endswith('.srt') and entry.is_file()]
+    except OSError:
+        srt_files = []
     
     print(f"Found {len(srt_files)} SRT files in {input_dir}")
     
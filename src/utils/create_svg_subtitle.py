@@ -78,17 +78,12 @@ def create_svg_subtitle(svg_path, start_time='00:00:01,000', end_time='00:00:05,
     Returns:
         str: Subtitle content
     """
-    # Format the SVG path with font and position tags
-    formatted_svg = f'<font face="{font_face}" size="{font_size}" color="{color}">{{\\an{position}}}{svg_path}</font>'
-    
-    # Create subtitle content
-    subtitle_content = f"""1
-{start_time} --> {end_time}
-{formatted_svg}
-
-"""
-    
-    return subtitle_content
+    # Build the cue and the SVG path with its font and position tags in one
+    # formatting pass
+    return (
+        f'1\n{start_time} --> {end_time}\n'
+        f'<font face="{font_face}" size="{font_size}" color="{color}">{{\\an{position}}}{svg_path}</font>\n\n'
+    )
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
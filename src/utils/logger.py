@@ -2,75 +2,99 @@
 
 import logging
 import atexit
-from PyQt6.QtWidgets import QTextEdit
-from PyQt6.QtCore import Qt, pyqtSignal, QObject
+from bisect import bisect_right
 
-class QTextEditLogger(logging.Handler, QObject):
-    """Custom logging handler that writes to a QTextEdit widget."""
+# Lowest level of each colored bucket above DEBUG
+_LEVEL_THRESHOLDS = [logging.INFO, logging.WARNING, logging.ERROR]
+# (prefix, suffix) wrapping a message, one pair per bucket from DEBUG to ERROR
+_LEVEL_WRAPPERS = [
+    ('<span style="color: #6272a4;">', '</span>'),
+    ('<span style="color: #50fa7b;">', '</span>'),
+    ('<span style="color: #ffb86c;">', '</span>'),
+    ('<span style="color: #ff5555;">', '</span>'),
+]
+
+# QTextEditLogger class, built on first access so that importing this module
+# does not load PyQt6 for callers that only need setup_logger
+_qtext_edit_logger_class = None
+
+def _lazy_qt():
+    """Import PyQt6 and define QTextEditLogger once, returning the class."""
+    global _qtext_edit_logger_class
+    if _qtext_edit_logger_class is not None:
+        return _qtext_edit_logger_class
     
-    new_record = pyqtSignal(str)
+    from PyQt6.QtWidgets import QTextEdit
+    from PyQt6.QtCore import pyqtSignal, QObject
     
-    def __init__(self, parent=None):
-        logging.Handler.__init__(self)
-        QObject.__init__(self, parent)
+    class QTextEditLogger(logging.Handler, QObject):
+        """Custom logging handler that writes to a QTextEdit widget."""
         
-        if isinstance(parent, QTextEdit):
-            self.widget = parent
-        else:
-            self.widget = QTextEdit(parent)
-            self.widget.setReadOnly(True)
-            self.widget.setStyleSheet("""
-                QTextEdit {
-                    background-color: #1e1e1e;
-                    color: #ffffff;
-                    border: 1px solid #3a3a3a;
-                    font-family: monospace;
-                }
-            """)
-        self.new_record.connect(self.widget.append)
+        new_record = pyqtSignal(str)
         
-        # Register cleanup on exit
-        atexit.register(self.cleanup)
-    
-    def emit(self, record):
-        """Emit a log record."""
-        try:
-            msg = self.format(record)
-            # Add color based on log level
-            if record.levelno >= logging.ERROR:
-                msg = f'<span style="color: #ff5555;">{msg}</span>'
-            elif record.levelno >= logging.WARNING:
-                msg = f'<span style="color: #ffb86c;">{msg}</span>'
-            elif record.levelno >= logging.INFO:
-                msg = f'<span style="color: #50fa7b;">{msg}</span>'
-            else:
-                msg = f'<span style="color: #6272a4;">{msg}</span>'
-            self.new_record.emit(msg)
-        except Exception:
-            self.handleError(record)
-    
-    def cleanup(self):
-        """Clean up resources before deletion."""
-        try:
-            # Disconnect signal
-            try:
-                self.new_record.disconnect()
-            except TypeError:
-                pass  # Signal was not connected
+        def __init__(self, parent=None):
+            logging.Handler.__init__(self)
+            QObject.__init__(self, parent)
             
-            # Remove handler from all loggers
-            for logger in logging.Logger.manager.loggerDict.values():
-                if isinstance(logger, logging.Logger):
-                    logger.removeHandler(self)
+            if isinstance(parent, QTextEdit):
+                self.widget = parent
+            else:
+                self.widget = QTextEdit(parent)
+                self.widget.setReadOnly(True)
+                self.widget.setStyleSheet("""
+                    QTextEdit {
+                        background-color: #1e1e1e;
+                        color: #ffffff;
+                        border: 1px solid #3a3a3a;
+                        font-family: monospace;
+                    }
+                """)
+            self.new_record.connect(self.widget.append)
             
-            # Clear widget reference
-            self.widget = None
-        except Exception:
-            pass  # Ignore cleanup errors
-    
-    def __del__(self):
-        """Ensure cleanup on deletion."""
-        self.cleanup()
+            # Register cleanup on exit
+            atexit.register(self.cleanup)
+        
+        def emit(self, record):
+            """Emit a log record."""
+            try:
+                msg = self.format(record)
+                # Add color based on log level
+                prefix, suffix = _LEVEL_WRAPPERS[bisect_right(_LEVEL_THRESHOLDS, record.levelno)]
+                self.new_record.emit(prefix + msg + suffix)
+            except Exception:
+                self.handleError(record)
+        
+        def cleanup(self):
+            """Clean up resources before deletion."""
+            try:
+                # Disconnect signal
+                try:
+                    self.new_record.disconnect()
+                except TypeError:
+                    pass  # Signal was not connected
+                
+                # Remove handler from all loggers
+                for logger in logging.Logger.manager.loggerDict.values():
+                    if isinstance(logger, logging.Logger):
+                        logger.removeHandler(self)
+                
+                # Clear widget reference
+                self.widget = None
+            except Exception:
+                pass  # Ignore cleanup errors
+        
+        def __del__(self):
+            """Ensure cleanup on deletion."""
+            self.cleanup()
+
+    _qtext_edit_logger_class = QTextEditLogger
+    return _qtext_edit_logger_class
+
+def __getattr__(name):
+    """Resolve QTextEditLogger lazily."""
+    if name == 'QTextEditLogger':
+        return _lazy_qt()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 def setup_logger(name: str, level=logging.INFO) -> logging.Logger:
     """Set up a logger with the given name and level.
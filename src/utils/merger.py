@@ -1,11 +1,13 @@
 #!/usr/bin/env python
 # author: Iraj Jelodari
 
-import datetime
 import codecs
+import os
 import re
 import logging
 
+import chardet
+
 RED = '#FF003B'
 BLUE = '#00ADFF'
 GREEN = '#B4FF00'
@@ -14,6 +16,46 @@ YELLOW = '#FFEB00'
 
 TIME_PATTERN = r'\d{1,2}:\d{1,2}:\d{1,2},\d{1,5} --> \d{1,2}:\d{1,2}:\d{1,2},\d{1,5}\r\n'
 
+_DIALOG_SPLIT_RE = re.compile('\r\n\r|\n\n')
+
+# Characters ignored when matching an encoding name against _BOM_MAP
+_ENCODING_STRIP = str.maketrans('', '', '-_ ')
+# Byte order mark written before the output for each normalized encoding name
+_BOM_MAP = {
+    'UTF8': codecs.BOM_UTF8,
+    'UTF16': codecs.BOM,
+    'UTF16LE': codecs.BOM_UTF16_LE,
+    'UTF16BE': codecs.BOM_UTF16_BE,
+    'UTF32': codecs.BOM_UTF32,
+    'UTF32LE': codecs.BOM_UTF32_LE,
+    'UTF32BE': codecs.BOM_UTF32_BE,
+}
+
+# Byte order marks identifying a subtitle file's encoding, longest first
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+# Bytes decoded to rule out an encoding before decoding a whole file
+_SNIFF_SIZE = 4096
+# Bytes given to chardet when none of the known encodings fit
+_DETECT_SIZE = 65536
+
+# Size of the blocks merge() writes the output file in
+_WRITE_BLOCK_SIZE = 1 << 16
+
+# Patterns for styling, shared by every Merger instance
+_SVG_PATH_RE = re.compile(r'\{\\an[0-9]\}m\s{1,3}[0-9]+\.[0-9]+\s{1,3}[0-9]+\.[0-9]+\s{1,3}b')
+_SVG_PATH_DATA_RE = re.compile(r'(\{\\an[0-9]\}m\s{1,3}[0-9]+\.[0-9]+.+)')
+_FONT_FACE_RE = re.compile(r'<font[^>]*face="([^"]+)"[^>]*>')
+_FONT_TAG_RE = re.compile(r'<font([^>]*)>')
+_FONT_ATTR_RE = re.compile(r'(face|size|color)="([^"]+)"')
+_POSITION_RE = re.compile(r'\{\\an(\d)\}')
+_HTML_TAG_RE = re.compile(r'<[^>]*>')
+
 
 class Merger():
     """
@@ -23,9 +65,7 @@ class Merger():
     """
 
     def __init__(self, output_path=".", output_name='subtitle_name.srt', output_encoding='utf-8'):
-        self.timestamps = []
         self.subtitles = []
-        self.lines = []
         self.output_path = output_path
         self.output_name = output_name
         self.output_encoding = output_encoding
@@ -42,25 +82,7 @@ class Merger():
             self.logger.setLevel(logging.INFO)
 
     def _insert_bom(self, content, encoding):
-        encoding = encoding.replace('-', '')\
-            .replace('_', '')\
-            .replace(' ', '')\
-            .upper()
-        if encoding in ['UTF64LE', 'UTF16', 'UTF16LE']:
-            return codecs.BOM + content
-        if encoding in ['UTF8']:
-            return codecs.BOM_UTF8 + content
-        if encoding in ['UTF32LE']:
-            return codecs.BOM_UTF32_LE + content
-        if encoding in ['UTF64BE']:
-            return codecs.BOM_UTF64_BE + content
-        if encoding in ['UTF16BE']:
-            return codecs.BOM_UTF32_BE + content
-        if encoding in ['UTF32BE']:
-            return codecs.BOM_UTF32_BE + content
-        if encoding in ['UTF32']:
-            return codecs.BOM_UTF32 + content
-        return content
+        return _BOM_MAP.get(encoding.translate(_ENCODING_STRIP).upper(), b'') + content
 
     def _set_subtitle_color(self, subtitle, color):
         """
@@ -78,7 +100,7 @@ class Merger():
         
         # Convert hex color to ASS format (BGR)
         if color.startswith('#'):
-            r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
+            r, g, b = bytes.fromhex(color[1:7])
             ass_color = f"&H{b:02X}{g:02X}{r:02X}&"
         else:
             # Use predefined color mapping
@@ -103,9 +125,54 @@ class Merger():
         Returns:
             bool: True if the text contains an SVG path, False otherwise
         """
-        return bool(re.search(r'{\an\d}m\s+\d+\.\d+\s+\d+\.\d+\s+b', text))
+        return bool(_SVG_PATH_RE.search(text))
+
+    def _font_style(self, color=None, size=None, bold=False):
+        """
+        Build the font markup shared by every line of a subtitle file
+        
+        Args:
+            color (str): Color in HTML format (#RRGGBB) or color name
+            size (int): Font size in pixels
+            bold (bool): Whether to make the text bold
+            
+        Returns:
+            tuple: (size/color attributes, text opening tag, full opening
+                markup for lines without a face, closing markup)
+        """
+        font_attrs = []
+        if size is not None:
+            font_attrs.append(f'size="{size}"')
+        if color:
+            font_attrs.append(f'color="{color}"')
+        font_attrs = ' '.join(font_attrs)
+        text_open = '<b>' if bold else ''
+        text_close = '</b></font>' if bold else '</font>'
+        return font_attrs, text_open, f'<font {font_attrs}>{text_open}', text_close
+
+    def _font_tag_attrs(self, text):
+        """
+        Collect the face, size and color attributes of the font tags in text
+        
+        Each attribute is taken from the first font tag that sets it, in a
+        single pass over the tags.
+        
+        Args:
+            text (str): The subtitle text
+            
+        Returns:
+            dict: Attribute values keyed by 'face', 'size' and 'color'
+        """
+        found = {}
+        for tag in _FONT_TAG_RE.finditer(text):
+            tag_attrs = dict(_FONT_ATTR_RE.findall(tag.group(1)))
+            for name, value in tag_attrs.items():
+                found.setdefault(name, value)
+            if len(found) == 3:
+                break
+        return found
 
-    def _set_subtitle_style(self, subtitle, color=None, size=None, bold=False, preserve_svg=False):
+    def _set_subtitle_style(self, subtitle, color=None, size=None, bold=False, preserve_svg=False, style=None, is_svg=None):
         """
         Apply style (color, size, and thickness) to subtitle text while preserving formatting
         
@@ -115,31 +182,27 @@ class Merger():
             size (int): Font size in pixels
             bold (bool): Whether to make the text bold
             preserve_svg (bool): Whether to preserve SVG path data
+            style (tuple): Precomputed font markup from _font_style
+            is_svg (bool): Whether the text is an SVG path, if already known
             
         Returns:
             str: Styled subtitle text with font tags
         """
         # Check if this is an SVG path and we should preserve it
-        if preserve_svg and self._is_svg_path(subtitle):
+        if preserve_svg and (self._is_svg_path(subtitle) if is_svg is None else is_svg):
             # For SVG paths, we want to preserve the original formatting
-            # Extract font face if present in the original line
-            face_match = re.search(r'<font[^>]*face="([^"]+)"[^>]*>', subtitle.strip())
-            face = face_match.group(1) if face_match else "Brady Bunch Remastered"
-            
-            # Extract size if present
-            size_match = re.search(r'<font[^>]*size="([^"]+)"[^>]*>', subtitle.strip())
-            svg_size = size_match.group(1) if size_match else "48"
-            
-            # Extract color if present
-            color_match = re.search(r'<font[^>]*color="([^"]+)"[^>]*>', subtitle.strip())
-            svg_color = color_match.group(1) if color_match else "#FFFFFF"
+            # Extract font face, size and color if present in the original line
+            svg_attrs = self._font_tag_attrs(subtitle)
+            face = svg_attrs.get('face', "Brady Bunch Remastered")
+            svg_size = svg_attrs.get('size', "48")
+            svg_color = svg_attrs.get('color', "#FFFFFF")
             
             # Extract position if present
-            position_match = re.search(r'{\\an(\d)}', subtitle)
+            position_match = _POSITION_RE.search(subtitle)
             position = position_match.group(1) if position_match else "7"
             
             # Extract the SVG path data
-            svg_path_match = re.search(r'({\an\d}m\s+\d+\.\d+.+)', subtitle)
+            svg_path_match = _SVG_PATH_DATA_RE.search(subtitle)
             if svg_path_match:
                 svg_path = svg_path_match.group(1)
                 return f'<font face="{face}" size="{svg_size}" color="{svg_color}">{svg_path}</font>\n'
@@ -147,62 +210,74 @@ class Merger():
             # If we couldn't extract the path, return the original
             return subtitle + '\n'
         
+        # Size and color are the same for every line, only the face varies
+        if style is None:
+            style = self._font_style(color, size, bold)
+        font_attrs, text_open, plain_open, text_close = style
+        
         # Split text into lines and process each line
         lines = subtitle.strip().split('\n')
         styled_lines = []
         
         for line in lines:
-            if not line.strip():
+            line = line.strip()
+            if not line:
                 continue
                 
-            # Extract all text content, ignoring all HTML tags
-            # This is a more aggressive approach that ensures we get just the raw text
-            raw_text = re.sub(r'<[^>]*>', '', line.strip())
-            
-            # Extract font face if present in the original line
-            face_match = re.search(r'<font[^>]*face="([^"]+)"[^>]*>', line.strip())
-            face = face_match.group(1) if face_match else None
+            if '<' not in line:
+                # Plain text, nothing to strip and no face to keep
+                raw_text = line
+                face = None
+            else:
+                # Extract all text content, ignoring all HTML tags
+                # This is a more aggressive approach that ensures we get just the raw text
+                raw_text = _HTML_TAG_RE.sub('', line)
+                
+                # Extract font face if present in the original line
+                face_match = _FONT_FACE_RE.search(line) if '<font' in line else None
+                face = face_match.group(1) if face_match else None
             
-            # Build font attributes
-            font_attrs = []
+            # Create the styled line with consistent formatting, prepending
+            # the line's own face to the shared attributes
             if face:
-                font_attrs.append(f'face="{face}"')
-            if size is not None:
-                font_attrs.append(f'size="{size}"')
-            if color:
-                font_attrs.append(f'color="{color}"')
-            
-            # Create the styled line with consistent formatting
-            if bold:
-                styled_lines.append(f'<font {" ".join(font_attrs)}><b>{raw_text}</b></font>')
+                attrs = f'face="{face}" {font_attrs}' if font_attrs else f'face="{face}"'
+                styled_lines.append(f'<font {attrs}>{text_open}{raw_text}{text_close}')
             else:
-                styled_lines.append(f'<font {" ".join(font_attrs)}>{raw_text}</font>')
+                styled_lines.append(plain_open + raw_text + text_close)
         
-        # Join lines with newlines and add final newline
-        return '\n'.join(styled_lines) + '\n'
+        # Join lines with newlines, the empty entry adding the final newline
+        styled_lines.append('')
+        return '\n'.join(styled_lines)
 
-    def _split_dialogs(self, dialogs, subtitle, color=None, size=None, top=False, bold=False, preserve_svg=False):
+    def _split_dialogs(self, dialogs, subtitle, color=None, size=None, top=False, bold=False, preserve_svg=False, style=None):
         """Split and process subtitle dialogs with styling."""
+        if style is None:
+            style = self._font_style(color, size, bold)
+        # SVG detection only matters when one of these options is set
+        check_svg = self.svg_filter_enabled or self.remove_text_entries or top or preserve_svg
         for dialog in dialogs:
             # Clean up dialog text
-            if dialog.startswith('\r\n'):
-                dialog = dialog.replace('\r\n', '', 1)
-            if dialog.startswith('\n'):
-                dialog = dialog[1:]
-            if dialog == '' or dialog == '\n' or dialog.rstrip().lstrip() == '':
+            dialog = dialog.lstrip('\r\n')
+            if not dialog.strip():
                 continue
                 
             try:
-                # Extract timestamp
-                if dialog.startswith('\r\n'):
-                    dialog = dialog[2:]
-                time = dialog.split('\n', 2)[1].split('-->')[0].split(',')[0]
-                timestamp = datetime.datetime.strptime(time, '%H:%M:%S').timestamp()
+                # Split the dialog once into index, time and text lines
+                lines = dialog.split('\n')
+                time = lines[1]
+                texts = lines[2:]
                 
-                # Extract text content
-                text_and_time = dialog.split('\n', 1)[1]
-                texts = text_and_time.split('\n')[1:]
-                time = text_and_time.split('\n')[0]
+                # The second line must be the cue's time range
+                if '-->' not in time:
+                    continue
+                
+                # Extract timestamp, slicing the fields straight out of the
+                # usual fixed HH:MM:SS,mmm layout
+                if time[2:3] == ':' and time[5:6] == ':' and time[8:9] == ',':
+                    timestamp = int(time[0:2]) * 3600 + int(time[3:5]) * 60 + int(time[6:8])
+                else:
+                    hours, minutes, seconds = time.split('-->', 1)[0].split(',', 1)[0].split(':')
+                    timestamp = int(hours) * 3600 + int(minutes) * 60 + int(seconds)
                 
                 # Combine text lines
                 text = '\n'.join(line for line in texts if line.strip())
@@ -210,7 +285,7 @@ class Merger():
                     continue
                 
                 # Check if this is an SVG path
-                is_svg = self._is_svg_path(text)
+                is_svg = check_svg and self._is_svg_path(text)
                 
                 # If SVG filtering is enabled, handle SVG paths specially
                 if self.svg_filter_enabled and is_svg:
@@ -224,24 +299,25 @@ class Merger():
                     continue
                 
                 # Apply style (color and size) to text
-                text = self._set_subtitle_style(text, color, size, bold, preserve_svg)
+                text = self._set_subtitle_style(text, color, size, bold, preserve_svg, style, is_svg)
                 
                 # Add position if needed
                 if top and not is_svg:  # Don't add top position to SVG paths as they have their own positioning
                     text = self._put_subtitle_top(text)
-                    
-                # Format final text with timestamp
-                text_and_time = f'{time}\n{text}'
                 
-                # Handle multiple dialogs at same timestamp
-                prev_dialog = subtitle['dialogs'].get(timestamp, '')
-                prev_dialog_without_timestamp = re.sub(TIME_PATTERN, '', prev_dialog)
-                
-                if re.findall(TIME_PATTERN, text_and_time):
-                    time = re.findall(TIME_PATTERN, text_and_time)[0]
+                # Drop blank lines once here rather than on every merge
+                if '\n\n' in text:
+                    text = text.replace('\n\n', '')
                     
-                subtitle['dialogs'][timestamp] = text_and_time + prev_dialog_without_timestamp
-                self.timestamps.append(timestamp)
+                # Handle multiple dialogs at same timestamp: keep the latest
+                # time line first and collect the texts, which merge() joins
+                # newest first
+                parts = subtitle['dialogs'].get(timestamp)
+                if parts is None:
+                    subtitle['dialogs'][timestamp] = [time, text]
+                else:
+                    parts[0] = time
+                    parts.append(text)
                 
             except Exception as e:
                 continue
@@ -255,6 +331,66 @@ class Merger():
                   (repr(text), codec, e))
             return b'An error has been occured in encoing by specifed `output_encoding`'
 
+    def _read_file(self, path):
+        """
+        Read a whole file with a single preallocated buffer.
+        
+        Args:
+            path (str): Path to the file
+            
+        Returns:
+            bytearray: The file contents
+        """
+        size = os.path.getsize(path)
+        buf = bytearray(size)
+        read = 0
+        with open(path, 'rb', buffering=0) as file, memoryview(buf) as view:
+            while read < size:
+                n = file.readinto(view[read:])
+                if not n:
+                    break
+                read += n
+        if read < size:
+            del buf[read:]
+        return buf
+
+    def _decode(self, data, encodings):
+        """
+        Decode subtitle data with the first encoding that accepts all of it.
+        
+        Args:
+            data (bytes): Raw subtitle file contents
+            encodings (list): Encodings to try, in order
+            
+        Returns:
+            tuple: (encoding, decoded text), or (None, None) if none worked
+        """
+        for encoding in encodings:
+            try:
+                # Rule out most wrong encodings on a prefix before decoding
+                # the whole file
+                codecs.getincrementaldecoder(encoding)().decode(data[:_SNIFF_SIZE], False)
+                return encoding, data.decode(encoding)
+            except (UnicodeDecodeError, LookupError):
+                continue
+        return None, None
+
+    def _iter_dialogs(self, data):
+        """
+        Yield the raw dialog blocks of decoded subtitle data one at a time.
+        
+        Args:
+            data (str): Decoded subtitle file contents
+            
+        Returns:
+            generator: Dialog blocks separated by blank lines
+        """
+        start = 0
+        for match in _DIALOG_SPLIT_RE.finditer(data):
+            yield data[start:match.start()]
+            start = match.end()
+        yield data[start:]
+
     def add(self, subtitle_address, codec="utf-8", color=WHITE, size=None, top=False, time_offset=0, bold=False, preserve_svg=False):
         """
         Add a subtitle file to be merged
@@ -281,23 +417,36 @@ class Merger():
         # List of encodings to try
         encodings = [codec, 'utf-8', 'utf-8-sig', 'cp932', 'shift_jis', 'euc_jp', 'iso2022_jp']
         
-        for encoding in encodings:
-            try:
-                with open(subtitle_address, 'rb') as file:
-                    data = file.read()
-                    try:
-                        decoded_data = data.decode(encoding)
-                        subtitle['codec'] = encoding  # Update codec to the one that worked
-                        dialogs = re.split('\r\n\r|\n\n', decoded_data)
-                        subtitle['data'] = decoded_data
-                        subtitle['raw_dialogs'] = dialogs
-                        self._split_dialogs(dialogs, subtitle, color, size, top, bold, preserve_svg)
-                        self.subtitles.append(subtitle)
-                        return  # Successfully read file, exit function
-                    except UnicodeDecodeError:
-                        continue
-            except Exception as e:
-                continue
+        # Size, color and weight are fixed for the whole file
+        style = self._font_style(color, size, bold)
+        
+        try:
+            data = self._read_file(subtitle_address)
+        except OSError:
+            data = None
+        
+        if data is not None:
+            # A byte order mark names the encoding outright
+            for bom, bom_encoding in _BOM_ENCODINGS:
+                if data.startswith(bom):
+                    encodings.insert(0, bom_encoding)
+                    break
+            
+            encoding, decoded_data = self._decode(data, encodings)
+            if encoding is None:
+                # Fall back to statistical detection on the start of the file
+                detected = chardet.detect(bytes(data[:_DETECT_SIZE]))['encoding']
+                if detected:
+                    encoding, decoded_data = self._decode(data, [detected])
+            
+            if encoding is not None:
+                subtitle['codec'] = encoding  # Update codec to the one that worked
+                # Release the raw bytes and stream the dialogs out of the
+                # decoded text without keeping a copy of the whole file
+                data = None
+                self._split_dialogs(self._iter_dialogs(decoded_data), subtitle, color, size, top, bold, preserve_svg, style)
+                self.subtitles.append(subtitle)
+                return  # Successfully read file, exit function
                 
         # If we get here, none of the encodings worked
         raise ValueError(f"Could not decode subtitle file {subtitle_address} with any of the supported encodings")
@@ -325,50 +474,79 @@ class Merger():
             return self.output_path + self.output_name
         return self.output_path + '/' + self.output_name
 
+    def _iter_encoded(self):
+        """
+        Yield the encoded parts of each merged dialog in output order.
+        
+        Returns:
+            generator: (counter, newline, text) byte strings for each dialog
+        """
+        # Group every dialog by timestamp in one pass; each group keeps the
+        # subtitles in the order they were added
+        grouped = {}
+        for sub in self.subtitles:
+            for t, parts in sub['dialogs'].items():
+                grouped.setdefault(t, []).append(parts)
+        entries = (parts for t in sorted(grouped) for parts in grouped[t])
+        total = sum(len(group) for group in grouped.values())
+        nl_enc = '\n'.encode(self.output_encoding)
+        # Digits encode to themselves in ASCII compatible encodings, so the
+        # counter can be formatted straight to bytes
+        ascii_digits = '0123456789'.encode(self.output_encoding) == b'0123456789'
+        for count, parts in enumerate(entries, start=1):
+            # Time line, then the texts sharing this second, newest first
+            dialog = parts[0] + '\n' + ''.join(parts[:0:-1])
+            if count == total and dialog.endswith('\n'):
+                # Newlines separate dialogs, so the last one gets none
+                dialog = dialog[:-1]
+            line = self._encode(dialog)
+            if ascii_digits:
+                count_bytes = b'%d' % count
+            else:
+                count_bytes = str(count).encode(self.output_encoding)
+            if count == 1:
+                byteOfCount = self._insert_bom(count_bytes, self.output_encoding)
+            else:
+                byteOfCount = nl_enc + count_bytes
+            yield byteOfCount, nl_enc, line
+
     def merge(self):
         # Reset SVG timestamp tracking before merging
         self.seen_svg_timestamps = set()
         
-        self.lines = []
-        self.timestamps = list(set(self.timestamps))
-        self.timestamps.sort()
-        count = 1
-        for t in self.timestamps:
-            for sub in self.subtitles:
-                if t in sub['dialogs'].keys():
-                    line = self._encode(sub['dialogs'][t].replace('\n\n', ''))
-                    if count == 1:
-                        byteOfCount = self._insert_bom(
-                            bytes(str(count), encoding=self.output_encoding),
-                            self.output_encoding
-                        )
-                    else:
-                        byteOfCount = '\n'.encode(
-                            self.output_encoding) + bytes(str(count), encoding=self.output_encoding)
-                    if sub['dialogs'][t].endswith('\n') != True:
-                        sub['dialogs'][t] = sub['dialogs'][t] + '\n'
-                    dialog = byteOfCount + \
-                        '\n'.encode(self.output_encoding) + line
-                    self.lines.append(dialog)
-                    count += 1
-        
-        # Check if lines list is not empty before accessing its elements
-        if self.lines:
-            if self.lines[-1].endswith(b'\x00\n\x00'):
-                self.lines[-1] = self.lines[-1][:-3] + b'\x00'
-            if self.lines[-1].endswith(b'\n'):
-                self.lines[-1] = self.lines[-1][:-1] + b''
-        
-        # Handle the case when no lines were generated (all entries were filtered out)
-        if not self.lines:
-            self.logger.warning("No subtitle entries remained after filtering. Creating empty output file.")
-            # Create an empty file or a file with a message
-            empty_content = "1\n00:00:01,000 --> 00:00:05,000\nNo subtitle entries remained after filtering.\n"
-            self.lines.append(self._encode(empty_content))
-        
-        with open(self.get_output_path(), 'w', encoding=self.output_encoding) as output:
-            output.buffer.writelines(self.lines)
-            print("'%s'" % (output.name), 'created successfully.')
+        # Write to a temporary file next to the output and move it into place
+        # once every dialog is encoded, so a failure (such as an unknown
+        # output encoding) leaves any existing output untouched
+        output_path = self.get_output_path()
+        tmp_path = output_path + '.tmp'
+        try:
+            with open(tmp_path, 'wb') as output:
+                # Accumulate dialogs in one buffer and flush it in large blocks
+                buf = bytearray()
+                has_dialogs = False
+                for count, nl, line in self._iter_encoded():
+                    has_dialogs = True
+                    buf += count
+                    buf += nl
+                    buf += line
+                    if len(buf) >= _WRITE_BLOCK_SIZE:
+                        output.write(buf)
+                        buf.clear()
+                
+                if not has_dialogs:
+                    # Handle the case when no lines were generated (all entries were filtered out)
+                    self.logger.warning("No subtitle entries remained after filtering. Creating empty output file.")
+                    # Create an empty file or a file with a message
+                    empty_content = "1\n00:00:01,000 --> 00:00:05,000\nNo subtitle entries remained after filtering.\n"
+                    buf += self._encode(empty_content)
+                
+                output.write(buf)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.replace(tmp_path, output_path)
+        print("'%s'" % (output_path), 'created successfully.')
 
 
 # How to use?
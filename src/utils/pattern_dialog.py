@@ -49,8 +49,8 @@ class PatternConflictDialog(QDialog):
         layout.addWidget(desc)
         
         # Create pattern selection group
-        pattern_group = QButtonGroup(self)
-        pattern_group.buttonClicked.connect(self.on_pattern_selected)
+        self.pattern_group = QButtonGroup(self)
+        self.pattern_group.buttonClicked.connect(self.on_pattern_selected)
         
         for i, pattern_info in enumerate(self.conflicts['patterns']):
             pattern_box = QGroupBox()
@@ -58,7 +58,7 @@ class PatternConflictDialog(QDialog):
             
             # Add radio button with pattern
             radio = QRadioButton(f"Pattern: {pattern_info['pattern']}")
-            pattern_group.addButton(radio, i)
+            self.pattern_group.addButton(radio, i)
             pattern_layout.addWidget(radio)
             
             # Add description
@@ -73,8 +73,9 @@ class PatternConflictDialog(QDialog):
                 pattern_layout.addWidget(examples_label)
                 
                 examples_list = QListWidget()
-                for example in pattern_info['matches']:
-                    examples_list.addItem(str(Path(example).name))
+                examples_list.setUpdatesEnabled(False)
+                examples_list.addItems([Path(example).name for example in pattern_info['matches']])
+                examples_list.setUpdatesEnabled(True)
                 examples_list.setMaximumHeight(100)
                 pattern_layout.addWidget(examples_list)
             
@@ -96,7 +97,7 @@ class PatternConflictDialog(QDialog):
         
     def on_pattern_selected(self, button):
         """Handle pattern selection."""
-        index = self.findChild(QButtonGroup).id(button)
+        index = self.pattern_group.id(button)
         self.selected_pattern = self.conflicts['patterns'][index]
     
     @staticmethod
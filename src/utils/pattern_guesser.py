@@ -4,16 +4,145 @@
 import os
 import re
 import logging
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import heapq
+from operator import itemgetter
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional, Any
+import codecs
 import unicodedata
-import chardet
+try:
+    # The C implementation is much faster when it is installed
+    import cchardet as chardet
+except ImportError:
+    import chardet
+
+# Pattern for Japanese characters: Hiragana and Katakana (adjacent blocks,
+# one range) and common Kanji
+_JP_CHAR_RE = re.compile(r'[\u3040-\u30FF\u4E00-\u9FAF]')
+# Number of characters sampled from each file by check_for_japanese
+_JP_SAMPLE_CHARS = 8192
+# Number of sample characters counted between early-exit checks
+_JP_SLICE_CHARS = 1024
+# Byte order marks and the encodings that decode them away; UTF-32 LE comes
+# before UTF-16 LE because its mark starts with the UTF-16 LE one
+_BOM_ENCODINGS = (
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+# Pattern for characters left out of the Japanese ratio: whitespace, decimal
+# digits and common punctuation
+_JP_SKIP_RE = re.compile(r'[\s\d.,;:!?()\-\[\]{}]+')
+# Pattern for a language tag in a file name, such as "Show.01.ja.srt"
+_LANG_TAG_RE = re.compile(r'\.(ja|jp|jpn|japanese|en|eng|english)\.', re.IGNORECASE)
+# Language tags that mark a Japanese subtitle file
+_JP_LANG_TAGS = frozenset({'ja', 'jp', 'jpn', 'japanese'})
+# Pattern for a file name token: a run of two or more characters between
+# delimiters (dots, whitespace, brackets, parentheses, underscores, dashes)
+_TOKEN_RE = re.compile(r'[^.\s\[\]\(\)_-]{2,}')
+# Pattern for a number that could be an episode number
+_EP_NUMBER_RE = re.compile(r'(?:^|\D)(\d{1,3})(?:\D|$)')
+# Pattern for splitting a file name at its first number
+_EP_NUMBER_SPLIT_RE = re.compile(r'\d{1,3}')
+# Pattern for any digit, which every episode format requires
+_DIGIT_RE = re.compile(r'\d')
+
+# File name markers of Japanese subtitles and the sub1 patterns they suggest
+_JP_NAME_MARKERS = [
+    ('.jpn.srt', r'\.jpn\.srt$'),
+    ('.ja[cc].srt', r'\.ja\[cc\]\.srt$'),
+    ('.jp.srt', r'\.jp\.srt$'),
+    ('.ja.srt', r'\.ja\.srt$'),
+    ('dialogue.srt', r'\.dialogue\.srt$'),
+]
+
+# File name markers of other subtitles and the sub2 patterns they suggest,
+# in order of priority: Portuguese, English, then other languages
+_NON_JP_NAME_MARKERS = [
+    ('.por.srt', r'\.por\.srt$'),
+    ('.pt.srt', r'\.pt\.srt$'),
+    ('.pt-br.srt', r'\.pt-br\.srt$'),
+    ('.portuguese.srt', r'\.portuguese\.srt$'),
+    ('.eng.srt', r'\.eng\.srt$'),
+    ('.en.srt', r'\.en\.srt$'),
+    ('.english.srt', r'\.english\.srt$'),
+    ('.fre.srt', r'\.fre\.srt$'),
+    ('.rus.srt', r'\.rus\.srt$'),
+    ('.ind.srt', r'\.ind\.srt$'),
+    ('.ara.srt', r'\.ara\.srt$'),
+]
+
+# Known episode number formats tried by detect_episode_patterns,
+# as (pattern, description, compiled pattern)
+_EPISODE_FORMATS = [(pattern, desc, re.compile(pattern)) for pattern, desc in [
+    # For Japanese files (SxxExx format)
+    (r'[Ss](\d+)[Ee](\d+)', "SxxExx format"),
+    
+    # For English files (various formats)
+    (r'(?:^|\s|_|-)\s*(\d{1,2})\s*(?:\s|$|\]|\[)', "Number between delimiters"),
+    (r'[\s._-](\d{1,2})(?:[\s._-]|$)', "Simple number"),
+    (r'[Ee]p(?:isode)?[\s._-]*(\d{1,2})', "Episode format"),
+    (r'(?:^|\s|_|-)\[?(\d{1,2})\]?(?:\s|$|\.)', "Bracketed number")
+]]
+
+# Known episode number formats used by detect_conflicts,
+# as (pattern, description, compiled pattern)
+_CONFLICT_EPISODE_FORMATS = [(pattern, desc, re.compile(pattern)) for pattern, desc in [
+    (r'[Ss](\d+)[Ee](\d+)', "SxxExx format (e.g. S01E05)"),
+    (r'[Ee]p(?:isode)?[\s._-]*(\d+)', "Episode format (e.g. ep05)"),
+    (r'[\s._-](\d{2,3})(?:[\s._-]|$)', "Simple number format (e.g. _05_)"),
+    (r'(?:^|\s|_|-)\[?(\d{2,3})\]?(?:\s|$|\.)', "Bracketed number format (e.g. [05])")
+]]
+
+# Unicode name fragments of Japanese characters, used by is_japanese_char
+_JP_SCRIPT_NAMES = ('HIRAGANA', 'KATAKANA', 'CJK UNIFIED')
 
 # Function to check if a character is Japanese (Hiragana, Katakana, or Kanji)
 def is_japanese_char(char: str) -> bool:
     """Check if a character is Japanese."""
+    # No character before U+3041 (the first Hiragana) has a Japanese name, so
+    # Latin text is answered without a Unicode database lookup
+    if char < '\u3041':
+        return False
     name = unicodedata.name(char, '')
-    return any(japanese_script in name for japanese_script in ['HIRAGANA', 'KATAKANA', 'CJK UNIFIED'])
+    return any(japanese_script in name for japanese_script in _JP_SCRIPT_NAMES)
+
+@lru_cache(maxsize=4096)
+def _name_tokens(text: str) -> Tuple[str, ...]:
+    """
+    Split a file name (or stem) into lowercase tokens, dropping empty and
+    single-character ones. Cached because the same names are tokenized by
+    several analysis steps.
+    """
+    return tuple(_TOKEN_RE.findall(text.lower()))
+
+@lru_cache(maxsize=64)
+def _filter_re(pattern: str) -> re.Pattern:
+    """
+    Compile a suggested pattern for case-insensitive matching against file
+    names. Cached so episode detection and verification share one compiled
+    object per pattern.
+    """
+    return re.compile(pattern, re.IGNORECASE)
+
+def _list_srt_files(directory: str) -> List[Path]:
+    """
+    List the .srt files directly inside a directory.
+    
+    Uses os.scandir so entries are filtered by name and cached type
+    information without building a Path for every entry.
+    """
+    try:
+        with os.scandir(directory) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name.endswith('.srt') and entry.is_file()]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
 
 def suggest_patterns(directory: str, logger=None) -> dict:
     """
@@ -45,8 +174,7 @@ def suggest_patterns(directory: str, logger=None) -> dict:
                 logger.setLevel(logging.INFO)
         
         # Find all SRT files in the directory
-        dir_path = Path(directory)
-        srt_files = list(dir_path.glob('*.srt'))
+        srt_files = _list_srt_files(directory)
         
         if not srt_files:
             return {
@@ -73,15 +201,43 @@ def suggest_patterns(directory: str, logger=None) -> dict:
         # Step 1: Analyze files to identify Japanese content
         japanese_files = []
         non_japanese_files = []
-        
-        for file_path in srt_files:
-            is_japanese, jp_percentage = check_for_japanese(file_path, logger)
+        jp_map = {}
+        
+        # When most file names carry a language tag, trust the tags and only
+        # read the content of files whose names are ambiguous
+        tags = [_LANG_TAG_RE.search(file_path.name) for file_path in srt_files]
+        if sum(tag is not None for tag in tags) < len(srt_files) * 0.8:
+            tags = [None] * len(srt_files)
+        untagged = [file_path for file_path, tag in zip(srt_files, tags) if tag is None]
+        
+        # Files are independent and mostly waiting on IO, so check them in
+        # parallel threads; map keeps the results in file order
+        results = []
+        if untagged:
+            with ThreadPoolExecutor(max_workers=min(8, len(untagged))) as executor:
+                results = list(executor.map(lambda path: check_for_japanese(path, logger), untagged))
+        results = iter(results)
+        
+        for file_path, tag in zip(srt_files, tags):
+            name = file_path.name
+            if tag is not None:
+                is_japanese = tag.group(1).lower() in _JP_LANG_TAGS
+                jp_map[file_path] = is_japanese
+                logger.debug(f"File {name} identified as {'Japanese' if is_japanese else 'non-Japanese'} by its '{tag.group(1)}' tag")
+                if is_japanese:
+                    japanese_files.append(name)
+                else:
+                    non_japanese_files.append(name)
+                continue
+            
+            is_japanese, jp_percentage = next(results)
+            jp_map[file_path] = is_japanese
             if is_japanese:
-                japanese_files.append(file_path.name)
-                logger.debug(f"File {file_path.name} identified as Japanese ({jp_percentage:.2f}% Japanese characters)")
+                japanese_files.append(name)
+                logger.debug(f"File {name} identified as Japanese ({jp_percentage:.2f}% Japanese characters)")
             else:
-                non_japanese_files.append(file_path.name)
-                logger.debug(f"File {file_path.name} identified as non-Japanese ({jp_percentage:.2f}% Japanese characters)")
+                non_japanese_files.append(name)
+                logger.debug(f"File {name} identified as non-Japanese ({jp_percentage:.2f}% Japanese characters)")
         
         # Step 2: Group files by patterns
         groups = group_files_by_pattern(srt_files, japanese_files, logger)
@@ -101,7 +257,7 @@ def suggest_patterns(directory: str, logger=None) -> dict:
         suggested_patterns.update(episode_patterns)
         
         # Check for conflicts in patterns
-        conflicts = detect_conflicts(srt_files, suggested_patterns, logger)
+        conflicts = detect_conflicts(srt_files, suggested_patterns, logger, jp_map)
         
         # Verify the patterns with some metrics
         verification = verify_patterns(srt_files, suggested_patterns, japanese_files, logger)
@@ -146,45 +302,81 @@ def suggest_patterns(directory: str, logger=None) -> dict:
 def check_for_japanese(file_path: Path, logger) -> Tuple[bool, float]:
     """
     Check if a file contains significant Japanese text.
-    Returns (is_japanese, percentage_of_japanese_chars)
+    Returns (is_japanese, percentage_of_japanese_chars), where the percentage
+    covers the part of the sample read before the result was certain.
     """
     try:
-        # Read the file with detection of encoding
-        with open(file_path, 'rb') as f:
-            raw_data = f.read(4096)  # Read first 4KB to determine encoding
-            result = chardet.detect(raw_data)
-            encoding = result['encoding'] or 'utf-8'
-        
-        # Read the file with detected encoding
-        with open(file_path, 'r', encoding=encoding, errors='replace') as f:
-            content = f.read(8192)  # Sample of file content
-        
-        # Count Japanese characters
-        jp_chars = 0
-        total_chars = 0
-        
-        # Regular expression for Japanese character ranges:
-        # Hiragana, Katakana, and common Kanji ranges
-        jp_pattern = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
-        
-        for char in content:
-            if not char.isspace() and not char.isdigit() and not char in '.,;:!?()-[]{}':
-                total_chars += 1
-                if jp_pattern.match(char):
-                    jp_chars += 1
-        
-        if total_chars == 0:
-            return False, 0.0
-            
-        jp_percentage = (jp_chars / total_chars) * 100
-        
-        # Consider it Japanese if more than 30% are Japanese characters
-        return jp_percentage > 30.0, jp_percentage
+        # Results are reused until the file is modified
+        stat = os.stat(file_path)
+        return _check_japanese_content(str(file_path), stat.st_mtime_ns, stat.st_size)
         
     except Exception as e:
         logger.error(f"Error checking Japanese content in {file_path}: {e}")
         return False, 0.0
 
+@lru_cache(maxsize=1024)
+def _check_japanese_content(path: str, mtime_ns: int, size: int) -> Tuple[bool, float]:
+    """
+    Sample a file and measure its share of Japanese characters for
+    check_for_japanese. The modification time and size are not read here;
+    they are part of the cache key so a changed file is scanned again.
+    """
+    # Read the sample once; 4 bytes per character always covers 8192
+    # characters of text
+    with open(path, 'rb') as f:
+        raw_data = f.read(_JP_SAMPLE_CHARS * 4)
+    
+    # Use the first 4KB to determine encoding
+    head = raw_data[:4096]
+    encoding = next((bom_encoding for bom, bom_encoding in _BOM_ENCODINGS
+                     if head.startswith(bom)), None)
+    if encoding is None:
+        try:
+            # Most subtitles are UTF-8, which needs no statistical detection
+            codecs.getincrementaldecoder('utf-8')().decode(head, False)
+            encoding = 'utf-8'
+        except UnicodeDecodeError:
+            result = chardet.detect(head)
+            encoding = result['encoding'] or 'utf-8'
+    
+    # Decode with the detected encoding, normalizing newlines as text mode
+    # reading would, and keep a sample of the file content
+    content = raw_data.decode(encoding, errors='replace')
+    content = content.replace('\r\n', '\n').replace('\r', '\n')[:_JP_SAMPLE_CHARS]
+    
+    # Count characters a slice at a time, stopping as soon as the rest of
+    # the sample can no longer move the ratio across the threshold
+    jp_chars = 0
+    total_chars = 0
+    for start in range(0, len(content), _JP_SLICE_CHARS):
+        chunk = content[start:start + _JP_SLICE_CHARS]
+        
+        # Count Japanese characters
+        jp_chars += len(_JP_CHAR_RE.findall(chunk))
+        
+        # Count the remaining characters, skipping whitespace, digits and punctuation
+        counted = _JP_SKIP_RE.sub('', chunk)
+        total_chars += len(counted)
+        if not counted.isascii():
+            # Digits such as superscripts are not decimal, so \d kept them
+            total_chars -= sum(map(str.isdigit, counted))
+        
+        remaining = len(content) - start - len(chunk)
+        if (jp_chars + remaining) * 10 <= (total_chars + remaining) * 3:
+            # Not Japanese even if every remaining character were
+            break
+        if jp_chars * 10 > (total_chars + remaining) * 3:
+            # Japanese even if no remaining character were
+            break
+    
+    if total_chars == 0:
+        return False, 0.0
+        
+    jp_percentage = (jp_chars / total_chars) * 100
+    
+    # Consider it Japanese if more than 30% are Japanese characters
+    return jp_percentage > 30.0, jp_percentage
+
 def group_files_by_pattern(files: List[Path], japanese_files: List[str], logger) -> Dict[str, List[str]]:
     """
     Group files by common patterns in their names.
@@ -195,127 +387,84 @@ def group_files_by_pattern(files: List[Path], japanese_files: List[str], logger)
     if japanese_files:
         groups["Japanese_Content"] = japanese_files
     
-    # Group by common tokens in filenames
-    token_patterns = {}
+    # Split filenames into tokens, each file counting once per token even if
+    # the token repeats in its name
+    file_tokens = [(file.name, dict.fromkeys(_name_tokens(file.stem))) for file in files]
     
-    for file in files:
-        # Split filename into tokens
-        tokens = re.split(r'[.\s\[\]\(\)_-]', file.stem.lower())
-        tokens = [t for t in tokens if t and len(t) > 1]  # Remove empty and single-char tokens
-        
+    # Only tokens that appear in multiple files form a group, so count them
+    # first and skip building lists for the rest
+    token_freq = Counter(token for _, tokens in file_tokens for token in tokens)
+    token_patterns = defaultdict(list)
+    
+    for name, tokens in file_tokens:
         for token in tokens:
-            if token not in token_patterns:
-                token_patterns[token] = []
-            token_patterns[token].append(file.name)
+            if token_freq[token] > 1:
+                token_patterns[token].append(name)
     
-    # Filter for tokens that appear in multiple files
-    for token, file_list in token_patterns.items():
-        if len(file_list) > 1:
-            groups[token] = file_list
+    groups.update(token_patterns)
     
     return groups
 
 def create_patterns_from_japanese_groups(groups, jp_files, non_jp_files, logger):
     """Create patterns based on Japanese content detection"""
-    # First find common base names without episode numbers
+    # First find common base names without episode numbers, as
+    # base name -> [first seen order, jp count, non-jp count, episodes]
     base_names = {}
-    episode_numbers = {}
+    
+    # Score base names while collecting them and keep the one that appears
+    # most consistently in both groups. Scores only grow, so tracking the
+    # best so far (earliest seen wins ties) gives the same result as
+    # scoring every base name afterwards
+    best_base_name = None
+    best_score = 0
+    best_order = 0
     
     # Process all files to extract base names and episode numbers
-    for file_list in [jp_files, non_jp_files]:
+    for file_list, count_index in ((jp_files, 1), (non_jp_files, 2)):
         for filename in file_list:
             # Skip already merged files
             if '.merged.srt' in filename or '-Sync.srt' in filename:
                 continue
                 
             # Try to find numbers that could be episode numbers
-            number_match = re.search(r'(?:^|\D)(\d{1,3})(?:\D|$)', filename)
+            number_match = _EP_NUMBER_RE.search(filename)
             if number_match:
                 episode = number_match.group(1)
                 # Get the parts before and after the number
-                parts = re.split(r'\d{1,3}', filename, maxsplit=1)
+                parts = _EP_NUMBER_SPLIT_RE.split(filename, maxsplit=1)
                 if len(parts) >= 2:
                     base_name = parts[0].strip('[] ._-')
-                    if base_name not in base_names:
-                        base_names[base_name] = {'jp': 0, 'non_jp': 0}
-                    if filename in jp_files:
-                        base_names[base_name]['jp'] += 1
-                    else:
-                        base_names[base_name]['non_jp'] += 1
+                    entry = base_names.get(base_name)
+                    if entry is None:
+                        entry = base_names[base_name] = [len(base_names), 0, 0, set()]
+                    entry[count_index] += 1
                     
                     # Store episode number for this base name
-                    if base_name not in episode_numbers:
-                        episode_numbers[base_name] = set()
-                    episode_numbers[base_name].add(episode)
-    
-    # Find the base name that appears most consistently in both groups
-    best_base_name = None
-    best_score = 0
-    
-    for base_name, counts in base_names.items():
-        # Skip if we don't have episode numbers for this base name
-        if base_name not in episode_numbers:
-            continue
-            
-        # Score is based on having similar counts in both groups
-        # and having multiple episode numbers
-        jp_count = counts['jp']
-        non_jp_count = counts['non_jp']
-        episode_count = len(episode_numbers[base_name])
-        
-        if jp_count > 0 and non_jp_count > 0 and episode_count > 1:
-            score = min(jp_count, non_jp_count) * episode_count
-            if score > best_score:
-                best_score = score
-                best_base_name = base_name
+                    entry[3].add(episode)
+                    
+                    # Score is based on having similar counts in both groups
+                    # and having multiple episode numbers
+                    order, jp_count, non_jp_count, episodes = entry
+                    if jp_count > 0 and non_jp_count > 0 and len(episodes) > 1:
+                        score = min(jp_count, non_jp_count) * len(episodes)
+                        if score > best_score or (score == best_score and order < best_order):
+                            best_score = score
+                            best_base_name = base_name
+                            best_order = order
     
     # If we found a good base name, create patterns
     if best_base_name:
         logger.info(f"Found matching base name: {best_base_name}")
         
-        # For Japanese files, check multiple patterns
-        jp_patterns = []
-        if any('.jpn.srt' in f for f in jp_files):
-            jp_patterns.append(r'\.jpn\.srt$')
-        if any('.ja[cc].srt' in f for f in jp_files):
-            jp_patterns.append(r'\.ja\[cc\]\.srt$')
-        if any('.jp.srt' in f for f in jp_files):
-            jp_patterns.append(r'\.jp\.srt$')
-        if any('.ja.srt' in f for f in jp_files):
-            jp_patterns.append(r'\.ja\.srt$')
-        if any('dialogue.srt' in f for f in jp_files):
-            jp_patterns.append(r'\.dialogue\.srt$')
+        # For Japanese files, check multiple patterns. Names are joined
+        # once so each marker is a single substring search; no marker
+        # contains a newline, so matches cannot span two names
+        jp_names = '\n'.join(jp_files)
+        jp_patterns = [pattern for marker, pattern in _JP_NAME_MARKERS if marker in jp_names]
             
         # For non-Japanese files, check multiple patterns in order of priority
-        non_jp_patterns = []
-        
-        # Portuguese patterns (highest priority)
-        if any('.por.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.por\.srt$')
-        if any('.pt.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.pt\.srt$')
-        if any('.pt-br.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.pt-br\.srt$')
-        if any('.portuguese.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.portuguese\.srt$')
-            
-        # English patterns (second priority)
-        if any('.eng.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.eng\.srt$')
-        if any('.en.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.en\.srt$')
-        if any('.english.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.english\.srt$')
-            
-        # Other language patterns (lowest priority)
-        if any('.fre.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.fre\.srt$')
-        if any('.rus.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.rus\.srt$')
-        if any('.ind.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.ind\.srt$')
-        if any('.ara.srt' in f for f in non_jp_files):
-            non_jp_patterns.append(r'\.ara\.srt$')
+        non_jp_names = '\n'.join(non_jp_files)
+        non_jp_patterns = [pattern for marker, pattern in _NON_JP_NAME_MARKERS if marker in non_jp_names]
         
         # If no patterns were found, use defaults
         if not jp_patterns:
@@ -328,7 +477,7 @@ def create_patterns_from_japanese_groups(groups, jp_files, non_jp_files, logger)
         sub2_pattern = '|'.join(non_jp_patterns)
         
         # Extract episode pattern based on file format
-        if any('S01E' in f for f in jp_files + non_jp_files):
+        if 'S01E' in jp_names or 'S01E' in non_jp_names:
             ep_pattern = r'S01E(\d+)'
         elif any(' - ' in f and '[' in f for f in jp_files + non_jp_files):
             ep_pattern = r' - (\d+) \['
@@ -388,63 +537,47 @@ def create_patterns_from_general_groups(groups, all_files, logger):
 
 def extract_common_tokens(file_names):
     """Extract common tokens/words from a list of filenames"""
-    all_tokens = []
+    token_counts = Counter()
     
     for name in file_names:
-        # Split by common delimiters and lowercase
-        tokens = re.split(r'[.\s\[\]\(\)_-]', name.lower())
-        tokens = [t for t in tokens if t and len(t) > 1 and not t.isdigit()]  # Remove empty, single-char, and pure digit tokens
-        all_tokens.extend(tokens)
-    
-    # Count token frequencies
-    token_counts = {}
-    for token in all_tokens:
-        if token not in token_counts:
-            token_counts[token] = 0
-        token_counts[token] += 1
+        # Split by common delimiters and lowercase, dropping pure digit tokens
+        token_counts.update(t for t in _name_tokens(name) if not t.isdigit())
     
     # Keep tokens that appear multiple times but not in nearly all files
-    common_tokens = [token for token, count in token_counts.items() 
-                   if count > 1 and count < len(file_names) * 0.9]
+    max_count = len(file_names) * 0.9
+    common_tokens = [(token, count) for token, count in token_counts.items()
+                     if 1 < count < max_count]
     
-    # Sort by frequency
-    common_tokens.sort(key=lambda x: token_counts[x], reverse=True)
-    
-    # Take top 15 tokens
-    return common_tokens[:15]
+    # Take top 15 tokens, most frequent first; nlargest keeps only those in
+    # its heap instead of sorting every token
+    return [token for token, _ in heapq.nlargest(15, common_tokens, key=itemgetter(1))]
 
 def detect_episode_patterns(files, patterns, logger):
     """Detect episode number patterns in filenames."""
-    # Known episode number formats to try
-    episode_formats = [
-        # For Japanese files (SxxExx format)
-        (r'[Ss](\d+)[Ee](\d+)', "SxxExx format"),
-        
-        # For English files (various formats)
-        (r'(?:^|\s|_|-)\s*(\d{1,2})\s*(?:\s|$|\]|\[)', "Number between delimiters"),
-        (r'[\s._-](\d{1,2})(?:[\s._-]|$)', "Simple number"),
-        (r'[Ee]p(?:isode)?[\s._-]*(\d{1,2})', "Episode format"),
-        (r'(?:^|\s|_|-)\[?(\d{1,2})\]?(?:\s|$|\.)', "Bracketed number")
-    ]
-    
     # Find files matching each pattern
-    sub1_files = [f for f in files if re.search(patterns.get('sub1_pattern', ''), f.name, re.IGNORECASE)]
-    sub2_files = [f for f in files if re.search(patterns.get('sub2_pattern', ''), f.name, re.IGNORECASE)]
-    
-    def find_episode_pattern(file_group):
-        if not file_group:
+    sub1_re = _filter_re(patterns.get('sub1_pattern', ''))
+    sub2_re = _filter_re(patterns.get('sub2_pattern', ''))
+    names = [f.name for f in files]
+    sub1_names = [name for name in names if sub1_re.search(name)]
+    sub2_names = [name for name in names if sub2_re.search(name)]
+    
+    def find_episode_pattern(group_names):
+        if not group_names:
             return r'(\d{1,2})', 0
             
+        # Every format needs a digit, so only names with one can match
+        names = [name for name in group_names if _DIGIT_RE.search(name)]
+        
         # Count matches for each pattern
         pattern_matches = {}
         episode_numbers = {}
         
-        for pattern, desc in episode_formats:
+        for pattern, desc, pattern_re in _EPISODE_FORMATS:
             matches = 0
             current_episodes = set()
             
-            for file in file_group:
-                match = re.search(pattern, file.name)
+            for name in names:
+                match = pattern_re.search(name)
                 if match:
                     # Get episode number from last group
                     ep_num = int(match.group(match.lastindex))
@@ -453,10 +586,10 @@ def detect_episode_patterns(files, patterns, logger):
                         current_episodes.add(ep_num)
             
             if matches > 0:
-                # Score based on sequential episodes and valid range
-                episode_list = sorted(current_episodes)
-                sequential_score = sum(1 for i in range(len(episode_list)-1) 
-                                    if episode_list[i+1] == episode_list[i] + 1)
+                # Score based on sequential episodes and valid range: each
+                # episode whose successor was also found is one sequential
+                # pair, so no sorting is needed
+                sequential_score = sum(ep + 1 in current_episodes for ep in current_episodes)
                 pattern_matches[pattern] = (matches, sequential_score)
                 episode_numbers[pattern] = current_episodes
         
@@ -473,8 +606,8 @@ def detect_episode_patterns(files, patterns, logger):
         return best_pattern or r'(\d{1,2})', best_score[0]
     
     # Find best patterns for each group
-    sub1_ep_pattern, sub1_matches = find_episode_pattern(sub1_files)
-    sub2_ep_pattern, sub2_matches = find_episode_pattern(sub2_files)
+    sub1_ep_pattern, sub1_matches = find_episode_pattern(sub1_names)
+    sub2_ep_pattern, sub2_matches = find_episode_pattern(sub2_names)
     
     logger.debug(f"Detected episode patterns - Sub1: {sub1_ep_pattern} ({sub1_matches} matches), Sub2: {sub2_ep_pattern} ({sub2_matches} matches)")
     
@@ -492,26 +625,39 @@ def verify_patterns(files, patterns, japanese_files, logger):
     sub1_ep_pattern = patterns.get('sub1_ep_pattern', '')
     sub2_ep_pattern = patterns.get('sub2_ep_pattern', '')
     
-    # Count matches for each pattern
-    sub1_matches = [f for f in files if re.search(sub1_pattern, f.name, re.IGNORECASE)]
-    sub2_matches = [f for f in files if re.search(sub2_pattern, f.name, re.IGNORECASE)]
-    
-    # Count overlap (files matching both patterns)
-    overlap = [f for f in sub1_matches if f in sub2_matches]
-    
-    # Count episode pattern matches
-    sub1_ep_matches = [f for f in sub1_matches if re.search(sub1_ep_pattern, f.name, re.IGNORECASE)]
-    sub2_ep_matches = [f for f in sub2_matches if re.search(sub2_ep_pattern, f.name, re.IGNORECASE)]
+    # Look up each compiled pattern once for all files
+    sub1_re = _filter_re(sub1_pattern)
+    sub2_re = _filter_re(sub2_pattern)
+    sub1_ep_re = _filter_re(sub1_ep_pattern)
+    sub2_ep_re = _filter_re(sub2_ep_pattern)
+    
+    # Count matches for each pattern, overlap (files matching both patterns)
+    # and episode pattern matches in a single pass
+    sub1_matches = sub2_matches = overlap = sub1_ep_matches = sub2_ep_matches = 0
+    for f in files:
+        name = f.name
+        is_sub1 = sub1_re.search(name) is not None
+        is_sub2 = sub2_re.search(name) is not None
+        if is_sub1:
+            sub1_matches += 1
+            if sub1_ep_re.search(name):
+                sub1_ep_matches += 1
+        if is_sub2:
+            sub2_matches += 1
+            if sub2_ep_re.search(name):
+                sub2_ep_matches += 1
+        if is_sub1 and is_sub2:
+            overlap += 1
     
     return {
-        "sub1_matches": len(sub1_matches),
-        "sub2_matches": len(sub2_matches),
-        "overlap": len(overlap),
-        "sub1_ep_matches": len(sub1_ep_matches),
-        "sub2_ep_matches": len(sub2_ep_matches)
+        "sub1_matches": sub1_matches,
+        "sub2_matches": sub2_matches,
+        "overlap": overlap,
+        "sub1_ep_matches": sub1_ep_matches,
+        "sub2_ep_matches": sub2_ep_matches
     }
 
-def detect_conflicts(files, patterns, logger):
+def detect_conflicts(files, patterns, logger, jp_map=None):
     """
     Detect files that match multiple patterns for the same episode number.
     
@@ -519,35 +665,33 @@ def detect_conflicts(files, patterns, logger):
         files: List of Path objects for subtitle files
         patterns: Dictionary of patterns to check
         logger: Logger instance
+        jp_map: Optional mapping of file path to whether it is Japanese, as
+            already worked out by suggest_patterns; files missing from it
+            are checked by content
         
     Returns:
         dict: Dictionary of conflicts by episode and language
     """
     conflicts = {}
     
-    # Known episode number formats
-    episode_formats = [
-        (r'[Ss](\d+)[Ee](\d+)', "SxxExx format (e.g. S01E05)"),
-        (r'[Ee]p(?:isode)?[\s._-]*(\d+)', "Episode format (e.g. ep05)"),
-        (r'[\s._-](\d{2,3})(?:[\s._-]|$)', "Simple number format (e.g. _05_)"),
-        (r'(?:^|\s|_|-)\[?(\d{2,3})\]?(?:\s|$|\.)', "Bracketed number format (e.g. [05])")
-    ]
-    
     try:
         # Group files by episode number
         episode_files = {}
         
         for file in files:
+            name = file.name
             # Try to extract episode number using each format
-            for pattern, desc in episode_formats:
-                match = re.search(pattern, file.name)
+            for pattern, desc, pattern_re in _CONFLICT_EPISODE_FORMATS:
+                match = pattern_re.search(name)
                 if match:
                     # Get the episode number (use last group if multiple)
                     ep_num = match.group(match.lastindex)
                     ep_num = str(int(ep_num))  # Normalize (e.g. "05" -> "5")
                     
                     # Determine language (Japanese or English)
-                    is_japanese, _ = check_for_japanese(file, logger)
+                    is_japanese = jp_map.get(file) if jp_map else None
+                    if is_japanese is None:
+                        is_japanese, _ = check_for_japanese(file, logger)
                     lang = "Japanese" if is_japanese else "English"
                     
                     # Create key for this episode and language
@@ -564,9 +708,10 @@ def detect_conflicts(files, patterns, logger):
                 pattern_groups = {}
                 
                 for file in files:
+                    name = file.name
                     # Find which pattern(s) this file matches
-                    for pattern, desc in episode_formats:
-                        if re.search(pattern, file.name):
+                    for pattern, desc, pattern_re in _CONFLICT_EPISODE_FORMATS:
+                        if pattern_re.search(name):
                             if pattern not in pattern_groups:
                                 pattern_groups[pattern] = {
                                     'pattern': pattern,
@@ -5,8 +5,22 @@ import os
 import sys
 import argparse
 from pathlib import Path
+from types import MappingProxyType
 from .merger import Merger, WHITE, YELLOW, RED, BLUE, GREEN
 
+# Map color names to hex values (read-only, shared by every call)
+COLOR_MAP = MappingProxyType({
+    'white': WHITE,
+    'yellow': YELLOW,
+    'red': RED,
+    'blue': BLUE,
+    'green': GREEN
+})
+
+# Encoded SRT cue written around the path data by create_svg_subtitle_file
+_SVG_CUE_HEADER = b"1\n00:00:01,000 --> 00:00:05,000\n"
+_SVG_CUE_FOOTER = b"\n\n"
+
 def main():
     """Main function to handle command line arguments and merge subtitles."""
     parser = argparse.ArgumentParser(description='Merge subtitle files with SVG path support')
@@ -48,19 +62,6 @@ def main():
     
     args = parser.parse_args()
     
-    # Map color names to hex values
-    color_map = {
-        'white': WHITE,
-        'yellow': YELLOW,
-        'red': RED,
-        'blue': BLUE,
-        'green': GREEN
-    }
-    
-    # Get color hex values
-    sub1_color = color_map.get(args.sub1_color.lower(), args.sub1_color)
-    sub2_color = color_map.get(args.sub2_color.lower(), args.sub2_color)
-    
     # Create merger
     merger = Merger(
         output_path=args.output_dir,
@@ -68,28 +69,23 @@ def main():
         output_encoding=args.encoding
     )
     
-    # Add first subtitle
-    print(f"Adding first subtitle: {args.sub1}")
-    merger.add(
-        subtitle_address=args.sub1,
-        codec=args.sub1_codec,
-        color=sub1_color,
-        size=args.sub1_size,
-        top=args.sub1_top,
-        bold=args.sub1_bold,
-        preserve_svg=True  # Always preserve SVG paths
-    )
-    
-    # Add second subtitle if provided
+    # Collect the first subtitle and the second one if provided, with
+    # color names mapped to hex values
+    subtitles = [('first', args.sub1, args.sub1_codec, args.sub1_color,
+                  args.sub1_size, args.sub1_top, args.sub1_bold)]
     if args.sub2:
-        print(f"Adding second subtitle: {args.sub2}")
+        subtitles.append(('second', args.sub2, args.sub2_codec, args.sub2_color,
+                          args.sub2_size, args.sub2_top, args.sub2_bold))
+    
+    for label, path, codec, color, size, top, bold in subtitles:
+        print(f"Adding {label} subtitle: {path}")
         merger.add(
-            subtitle_address=args.sub2,
-            codec=args.sub2_codec,
-            color=sub2_color,
-            size=args.sub2_size,
-            top=args.sub2_top,
-            bold=args.sub2_bold,
+            subtitle_address=path,
+            codec=codec,
+            color=COLOR_MAP.get(color.lower(), color),
+            size=size,
+            top=top,
+            bold=bold,
             preserve_svg=True  # Always preserve SVG paths
         )
     
@@ -106,15 +102,10 @@ def create_svg_subtitle_file(output_path, svg_data):
         output_path (str): Path to save the subtitle file
         svg_data (str): SVG path data to include in the subtitle
     """
-    # Create a simple SRT file with the SVG path
-    srt_content = """1
-00:00:01,000 --> 00:00:05,000
-{0}
-
-""".format(svg_data)
-    
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(srt_content)
+    # Create a simple SRT file with the SVG path; only the path data needs
+    # encoding, the cue around it is already bytes
+    with open(output_path, 'wb') as f:
+        f.write(_SVG_CUE_HEADER + svg_data.encode('utf-8') + _SVG_CUE_FOOTER)
     
     print(f"Created SVG subtitle file: {output_path}")
 
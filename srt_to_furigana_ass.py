@@ -16,6 +16,8 @@ import sys
 import re
 import argparse
 import pysubs2
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache, partial
 from pathlib import Path
 
 # Default style settings
@@ -31,6 +33,89 @@ DEFAULT_RUBY_OUTLINE_SIZE = 1
 DEFAULT_SHADOW_SIZE = 2
 DEFAULT_RUBY_SHADOW_SIZE = 1
 
+# Directories with fewer SRT files than this are converted serially, since
+# starting worker processes would cost more than it saves
+MIN_PARALLEL_FILES = 4
+
+# Pattern for kanji with furigana in parentheses: any non-whitespace
+# characters followed by text in parentheses
+_RUBY_RE = re.compile(r'(\S+?)\(([^)]+)\)')
+
+def _replace_with_ruby(match):
+    """Replace a kanji(furigana) match with an ASS ruby tag."""
+    kanji = match.group(1)
+    furigana = match.group(2)
+    
+    # Use the standard \rt tag for ruby text
+    return f"{{\\rt({furigana})}}{kanji}"
+
+@lru_cache(maxsize=8)
+def _build_styles(config_items):
+    """
+    Build the Default and Ruby styles for a configuration.
+    
+    Args:
+        config_items (tuple): Sorted (key, value) pairs of the style config
+    
+    Returns:
+        tuple: (default_style, ruby_style) templates; callers copy them
+    """
+    config = dict(config_items)
+    
+    # Add Default style
+    default_style = pysubs2.SSAStyle(
+        fontname=config['font'],
+        fontsize=config['font_size'],
+        primarycolor=config['text_color'],
+        secondarycolor="&H000000FF",
+        outlinecolor=config['outline_color'],
+        backcolor=config['shadow_color'],
+        bold=False,
+        italic=False,
+        underline=False,
+        strikeout=False,
+        scalex=100,
+        scaley=100,
+        spacing=0,
+        angle=0,
+        borderstyle=1,
+        outline=config['outline_size'],
+        shadow=config['shadow_size'],
+        alignment=2,
+        marginl=10,
+        marginr=10,
+        marginv=20,
+        encoding=1
+    )
+        
+    # Add Ruby style
+    ruby_style = pysubs2.SSAStyle(
+        fontname=config['font'],
+        fontsize=config['ruby_font_size'],
+        primarycolor=config['ruby_color'],
+        secondarycolor="&H000000FF",
+        outlinecolor=config['outline_color'],
+        backcolor=config['shadow_color'],
+        bold=False,
+        italic=False,
+        underline=False,
+        strikeout=False,
+        scalex=100,
+        scaley=100,
+        spacing=0,
+        angle=0,
+        borderstyle=1,
+        outline=config['ruby_outline_size'],
+        shadow=config['ruby_shadow_size'],
+        alignment=8,
+        marginl=10,
+        marginr=10,
+        marginv=20,
+        encoding=1
+    )
+    
+    return default_style, ruby_style
+
 def create_ass_from_srt(srt_file, output_dir=None, config=None):
     """
     Convert an SRT file to ASS format with furigana using pysubs2.
@@ -73,59 +158,11 @@ def create_ass_from_srt(srt_file, output_dir=None, config=None):
         # Create styles for the ASS file
         subs.styles = {}  # Clear existing styles
         
-        # Add Default style
-        default_style = pysubs2.SSAStyle(
-            fontname=config['font'],
-            fontsize=config['font_size'],
-            primarycolor=config['text_color'],
-            secondarycolor="&H000000FF",
-            outlinecolor=config['outline_color'],
-            backcolor=config['shadow_color'],
-            bold=False,
-            italic=False,
-            underline=False,
-            strikeout=False,
-            scalex=100,
-            scaley=100,
-            spacing=0,
-            angle=0,
-            borderstyle=1,
-            outline=config['outline_size'],
-            shadow=config['shadow_size'],
-            alignment=2,
-            marginl=10,
-            marginr=10,
-            marginv=20,
-            encoding=1
-        )
-        subs.styles["Default"] = default_style
-        
-        # Add Ruby style
-        ruby_style = pysubs2.SSAStyle(
-            fontname=config['font'],
-            fontsize=config['ruby_font_size'],
-            primarycolor=config['ruby_color'],
-            secondarycolor="&H000000FF",
-            outlinecolor=config['outline_color'],
-            backcolor=config['shadow_color'],
-            bold=False,
-            italic=False,
-            underline=False,
-            strikeout=False,
-            scalex=100,
-            scaley=100,
-            spacing=0,
-            angle=0,
-            borderstyle=1,
-            outline=config['ruby_outline_size'],
-            shadow=config['ruby_shadow_size'],
-            alignment=8,
-            marginl=10,
-            marginr=10,
-            marginv=20,
-            encoding=1
-        )
-        subs.styles["Ruby"] = ruby_style
+        # Add Default and Ruby styles, copied from the templates built once
+        # per configuration
+        default_style, ruby_style = _build_styles(tuple(sorted(config.items())))
+        subs.styles["Default"] = default_style.copy()
+        subs.styles["Ruby"] = ruby_style.copy()
         
         # Process each subtitle line
         for line in subs:
@@ -163,22 +200,10 @@ def add_ruby_tags(text):
     # Replace newlines with ASS newline format
     text = text.replace('\n', '\\N')
     
-    # Define the pattern for finding kanji with furigana in parentheses
-    # This pattern looks for any non-whitespace characters followed by text in parentheses
-    pattern = r'(\S+?)\(([^)]+)\)'
-    
-    # Function to replace matches with ASS ruby tags
-    def replace_with_ruby(match):
-        kanji = match.group(1)
-        furigana = match.group(2)
-        
-        # Use the standard \rt tag for ruby text
-        return f"{{\\rt({furigana})}}{kanji}"
-    
-    # Apply the replacement
-    result = re.sub(pattern, replace_with_ruby, text)
-    
-    return result
+    # Apply the replacement; text without parentheses has nothing to match
+    if '(' not in text:
+        return text
+    return _RUBY_RE.sub(_replace_with_ruby, text)
 
 def process_directory(input_dir='.', output_dir=None, config=None):
     """
@@ -198,8 +223,14 @@ def process_directory(input_dir='.', output_dir=None, config=None):
     else:
         output_path = input_path
     
-    # Find all SRT files
-    srt_files = list(input_path.glob('*.srt'))
+    # Find all SRT files, filtering directory entries by name so no entry
+    # needs a stat call or a Path object
+    try:
+        with os.scandir(input_path) as entries:
+            srt_files = [entry.path for entry in entries
+                         if entry.name.endswith('.srt') and entry.is_file()]
+    except OSError:
+        srt_files = []
     
     if not srt_files:
         print(f"No SRT files found in {input_dir}")
@@ -207,9 +238,15 @@ def process_directory(input_dir='.', output_dir=None, config=None):
     
     print(f"Found {len(srt_files)} SRT files in {input_dir}")
     
-    # Process each SRT file
-    for srt_file in srt_files:
-        create_ass_from_srt(str(srt_file), str(output_path), config)
+    # Process each SRT file; files are independent, so convert them in
+    # parallel processes when there are enough of them
+    convert = partial(create_ass_from_srt, output_dir=str(output_path), config=config)
+    if len(srt_files) < MIN_PARALLEL_FILES:
+        for srt_file in srt_files:
+            convert(srt_file)
+    else:
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+            list(executor.map(convert, srt_files))
 
 def parse_args():
     """Parse command line arguments."""
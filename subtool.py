@@ -11,27 +11,35 @@ from pathlib import Path
 # Add src directory to path
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
+# Common locations of the Qt platform plugins, in order of preference
+QT_PLUGIN_PATHS = (
+    '/usr/lib/qt/plugins',
+    '/usr/lib/qt6/plugins',
+    '/usr/lib/x86_64-linux-gnu/qt6/plugins',
+    '/usr/local/lib/qt6/plugins',
+    '/usr/lib64/qt6/plugins'
+)
+
+def _find_qt_plugin_path():
+    """Return the first existing Qt plugin directory, or None."""
+    for path in QT_PLUGIN_PATHS:
+        if os.path.isdir(path):
+            return path
+    return None
+
 def main():
     try:
         # Import and run the main function from src.main
         from src.main import main as app_main
         
-        # Set up QT environment variables if needed
-        if sys.platform.startswith('linux'):
+        # Set up QT environment variables if needed; a path the user already
+        # set is kept and saves probing the filesystem
+        if sys.platform.startswith('linux') and not os.environ.get('QT_PLUGIN_PATH'):
             # Try to locate the Qt platform plugins
-            potential_plugin_paths = [
-                '/usr/lib/qt/plugins',
-                '/usr/lib/qt6/plugins',
-                '/usr/lib/x86_64-linux-gnu/qt6/plugins',
-                '/usr/local/lib/qt6/plugins',
-                '/usr/lib64/qt6/plugins'
-            ]
-            
-            for path in potential_plugin_paths:
-                if os.path.exists(path):
-                    os.environ['QT_PLUGIN_PATH'] = path
-                    print(f"Set QT_PLUGIN_PATH to {path}")
-                    break
+            path = _find_qt_plugin_path()
+            if path:
+                os.environ['QT_PLUGIN_PATH'] = path
+                print(f"Set QT_PLUGIN_PATH to {path}")
         
         # Run the application
         app_main()
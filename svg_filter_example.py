@@ -16,8 +16,8 @@ except ImportError:
 
 def main():
     """Demonstrate SVG filtering functionality."""
-    print("SVG Filtering Example")
-    print("====================")
+    print("SVG Filtering Example\n"
+          "====================")
     
     # Define paths
     example_stars_path = "example_stars.srt"
@@ -25,13 +25,13 @@ def main():
     
     # Check if example file exists
     if not os.path.exists(example_stars_path):
-        print(f"Error: {example_stars_path} does not exist.")
-        print("Please run the script in the same directory as example_stars.srt.")
+        print(f"Error: {example_stars_path} does not exist.\n"
+              "Please run the script in the same directory as example_stars.srt.")
         return
     
     # Example 1: Basic merge with SVG filtering
-    print("\nExample 1: Basic merge with SVG filtering")
-    print("----------------------------------------")
+    print("\nExample 1: Basic merge with SVG filtering\n"
+          "----------------------------------------")
     
     # Create merger with SVG filtering enabled
     merger1 = Merger(
@@ -58,8 +58,8 @@ def main():
     print(f"Filtered subtitle saved to: {os.path.join(output_dir, 'filtered_stars.srt')}")
     
     # Example 2: Merge with SVG filtering and text removal
-    print("\nExample 2: Merge with SVG filtering and text removal")
-    print("--------------------------------------------------")
+    print("\nExample 2: Merge with SVG filtering and text removal\n"
+          "--------------------------------------------------")
     
     # Create merger with SVG filtering enabled and text removal
     merger2 = Merger(
@@ -87,8 +87,8 @@ def main():
     print(f"SVG-only subtitle saved to: {os.path.join(output_dir, 'svg_only_stars.srt')}")
     
     # Example 3: Merge with another subtitle file
-    print("\nExample 3: Merge with another subtitle file")
-    print("----------------------------------------")
+    print("\nExample 3: Merge with another subtitle file\n"
+          "----------------------------------------")
     
     # Check if example subtitle file exists
     example_subtitle_path = "example_subtitle.srt"
@@ -131,15 +131,15 @@ def main():
     
     print(f"Merged subtitle with filtering saved to: {os.path.join(output_dir, 'merged_with_filtering.srt')}")
     
-    print("\nYou can now use these subtitle files with MPV player:")
-    print(f"mpv --sub-file=filtered_stars.srt your_video_file.mp4")
-    print(f"mpv --sub-file=svg_only_stars.srt your_video_file.mp4")
-    print(f"mpv --sub-file=merged_with_filtering.srt your_video_file.mp4")
-    
-    print("\nSVG Filtering Options:")
-    print("1. Enable SVG filtering: merger.enable_svg_filtering(True)")
-    print("2. Remove text entries: merger.set_remove_text_entries(True)")
-    print("3. Preserve SVG paths: add(..., preserve_svg=True)")
+    print("\nYou can now use these subtitle files with MPV player:\n"
+          "mpv --sub-file=filtered_stars.srt your_video_file.mp4\n"
+          "mpv --sub-file=svg_only_stars.srt your_video_file.mp4\n"
+          "mpv --sub-file=merged_with_filtering.srt your_video_file.mp4\n"
+          "\n"
+          "SVG Filtering Options:\n"
+          "1. Enable SVG filtering: merger.enable_svg_filtering(True)\n"
+          "2. Remove text entries: merger.set_remove_text_entries(True)\n"
+          "3. Preserve SVG paths: add(..., preserve_svg=True)")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
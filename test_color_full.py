@@ -1,9 +1,7 @@
 #!/usr/bin/env python3
-import os
 import re
 import logging
 from pathlib import Path
-import pysubs2
 from src.utils.ass_converter import create_ass_from_srt
 
 # Set up logging
@@ -11,14 +9,13 @@ logging.basicConfig(level=logging.DEBUG,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
-# Create test directory if it doesn't exist
-test_dir = Path("test_subs")
-test_dir.mkdir(exist_ok=True)
+# Pattern for an ASS color tag
+COLOR_TAG_RE = re.compile(r'\\c&H[0-9A-F]+&')
+# Pattern for a dialogue line, or a color tag outside one
+ASS_SCAN_RE = re.compile(r'(?P<dialogue>Dialogue: [^\n]+)|(?P<color>\\c&H[0-9A-F]+&)')
 
-# Create a test SRT file with color tags
-test_srt_path = test_dir / "test_color_full.srt"
-with open(test_srt_path, "w", encoding="utf-8") as f:
-    f.write("""1
+# Test SRT content with color tags
+TEST_SRT = """1
 00:00:01,000 --> 00:00:05,000
 <font color="blue">青い</font>空(そら)と<font color="red">赤い</font>夕日(ゆうひ)
 
@@ -29,58 +26,87 @@ with open(test_srt_path, "w", encoding="utf-8") as f:
 3
 00:00:11,000 --> 00:00:15,000
 <font color="darkblue">深い</font>海(うみ)と<font color="orange">オレンジ</font>色(いろ)の魚(さかな)
-""")
+"""
 
-logger.info(f"Created test SRT file at {test_srt_path}")
+def test_color_full():
+    """Convert a sample SRT with color tags and check the ASS output."""
+    # Create test directory if it doesn't exist
+    test_dir = Path("test_subs")
+    test_dir.mkdir(exist_ok=True)
 
-# Run the converter
-try:
-    output_file = create_ass_from_srt(
-        str(test_srt_path),
-        auto_generate_furigana=False,
-        advanced_styling=True
-    )
-    logger.info(f"Successfully created ASS file at {output_file}")
+    # Create a test SRT file with color tags
+    test_srt_path = test_dir / "test_color_full.srt"
+    with open(test_srt_path, "w", encoding="utf-8") as f:
+        f.write(TEST_SRT)
+
+    logger.info(f"Created test SRT file at {test_srt_path}")
+
+    # Run the converter
+    try:
+        output_file = create_ass_from_srt(
+            str(test_srt_path),
+            auto_generate_furigana=False,
+            advanced_styling=True
+        )
+        logger.info(f"Successfully created ASS file at {output_file}")
     
-    # Read the ASS file
-    with open(output_file, "r", encoding="utf-8") as f:
-        ass_content = f.read()
+        # Read the ASS file
+        with open(output_file, "r", encoding="utf-8") as f:
+            ass_content = f.read()
     
-    # Check for color tags
-    color_tags = re.findall(r'\\c&H[0-9A-F]+&', ass_content)
-    logger.info(f"Found {len(color_tags)} color tags in the ASS file")
-    for i, tag in enumerate(color_tags):
-        logger.info(f"Color tag {i+1}: {tag}")
+        # Collect color tags, dialogue lines and dialogue lines with color
+        # tags in one scan; tags inside a dialogue line are found within it
+        color_tags = []
+        dialogue_lines = []
+        color_dialogue_lines = []
+        for match in ASS_SCAN_RE.finditer(ass_content):
+            line = match.group('dialogue')
+            if line is None:
+                color_tags.append(match.group('color'))
+                continue
+            dialogue_lines.append(line)
+            line_tags = COLOR_TAG_RE.findall(line)
+            if line_tags:
+                color_tags.extend(line_tags)
+            if "\\c&H" in line:
+                color_dialogue_lines.append(line)
     
-    # Check for dialogue lines
-    dialogue_lines = re.findall(r'Dialogue: [^\n]+', ass_content)
-    logger.info(f"Found {len(dialogue_lines)} dialogue lines in the ASS file")
-    for i, line in enumerate(dialogue_lines[:10]):
-        logger.info(f"Dialogue line {i+1}: {line}")
+        # Check for color tags
+        logger.info(f"Found {len(color_tags)} color tags in the ASS file")
+        for i, tag in enumerate(color_tags):
+            logger.info(f"Color tag {i+1}: {tag}")
     
-    # Check for dialogue lines with color tags
-    color_dialogue_lines = [line for line in dialogue_lines if "\\c&H" in line]
-    logger.info(f"Found {len(color_dialogue_lines)} dialogue lines with color tags")
-    for i, line in enumerate(color_dialogue_lines[:5]):
-        logger.info(f"Color dialogue line {i+1}: {line}")
+        # Check for dialogue lines
+        logger.info(f"Found {len(dialogue_lines)} dialogue lines in the ASS file")
+        for i, line in enumerate(dialogue_lines[:10]):
+            logger.info(f"Dialogue line {i+1}: {line}")
     
-    # If no color tags found in dialogue lines, this is an issue
-    if not color_dialogue_lines:
-        logger.warning("No color tags found in dialogue lines!")
+        # Check for dialogue lines with color tags
+        logger.info(f"Found {len(color_dialogue_lines)} dialogue lines with color tags")
+        for i, line in enumerate(color_dialogue_lines[:5]):
+            logger.info(f"Color dialogue line {i+1}: {line}")
+    
+        # If no color tags found in dialogue lines, this is an issue
+        if not color_dialogue_lines:
+            logger.warning("No color tags found in dialogue lines!")
         
-        # Let's examine the extract_furigana_pairs function output
-        from src.utils.ass_converter import extract_furigana_pairs
+            # Let's examine the extract_furigana_pairs function output
+            from src.utils.ass_converter import extract_furigana_pairs
         
-        # Test with a simple example
-        test_text = '<font color="blue">青い</font>空(そら)と<font color="red">赤い</font>夕日(ゆうひ)'
-        pairs = extract_furigana_pairs(test_text, auto_generate=False)
-        logger.info(f"Extract furigana pairs output for test text: {pairs}")
+            # Test with a simple example
+            test_text = '<font color="blue">青い</font>空(そら)と<font color="red">赤い</font>夕日(ゆうひ)'
+            pairs = extract_furigana_pairs(test_text, auto_generate=False)
+            logger.info(f"Extract furigana pairs output for test text: {pairs}")
         
-        # Check if the pairs contain color tags
-        color_pairs = [pair for pair in pairs if "<font color=" in pair[0]]
-        logger.info(f"Found {len(color_pairs)} pairs with color tags")
-        for i, pair in enumerate(color_pairs):
-            logger.info(f"Color pair {i+1}: {pair}")
+            # Check if the pairs contain color tags
+            color_count = sum(1 for pair in pairs if "<font color=" in pair[0])
+            logger.info(f"Found {color_count} pairs with color tags")
+            color_pairs = (pair for pair in pairs if "<font color=" in pair[0])
+            for i, pair in enumerate(color_pairs):
+                logger.info(f"Color pair {i+1}: {pair}")
     
-except Exception as e:
-    logger.error(f"Error in test script: {e}", exc_info=True) 
\ No newline at end of file
+    except Exception as e:
+        logger.error(f"Error in test script: {e}", exc_info=True) 
+
+if __name__ == "__main__":
+    test_color_full()
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import re
+from functools import lru_cache
 
 # Sample text with color tags
 text = '<font color="blue">青い</font>空(そら)と<font color="red">赤い</font>夕日(ゆうひ)'
@@ -21,39 +22,46 @@ COLOR_MAP = {
     "darkgreen": "&H2B8000&"
 }
 
-print(f"Original text: {text}")
+# Pattern for an HTML font color tag and the text it wraps
+FONT_COLOR_RE = re.compile(r'<font color="([^"]+)">(.*?)</font>')
 
-# Process color tags
-if "<font color=" in text:
-    print("Found color tags in text")
-    # Extract all color tags
-    color_matches = list(re.finditer(r'<font color="([^"]+)">(.*?)</font>', text))
+@lru_cache(maxsize=256)
+def html_to_ass_color(color):
+    """Convert an HTML color to ASS format; cached since colors repeat."""
+    if color.startswith('#'):
+        # Parse the RRGGBB digits once and take the channels apart
+        value = int(color[1:7], 16)
+        return f"&H{value & 0xFF:02X}{(value >> 8) & 0xFF:02X}{value >> 16:02X}&"
+    # Map common color names to ASS colors
+    return COLOR_MAP.get(color.lower(), "&H00FFFFFF&")
+
+def replace_font_color(match):
+    """Replace an HTML font color tag with the ASS color tag."""
+    color = match.group(1)
+    content = match.group(2)
+    print(f"Processing color tag: color={color}, content={content}")
+    
+    # Convert HTML color to ASS color
+    ass_color = html_to_ass_color(color)
     
-    # Process each match from end to beginning to avoid index issues
-    processed_text = text
-    for match in reversed(color_matches):
-        color = match.group(1)
-        content = match.group(2)
-        print(f"Processing color tag: color={color}, content={content}")
-        
-        # Convert HTML color to ASS color
-        if color.startswith('#'):
-            r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
-            ass_color = f"&H{b:02X}{g:02X}{r:02X}&"
-        else:
-            # Map common color names to ASS colors
-            ass_color = COLOR_MAP.get(color.lower(), "&H00FFFFFF&")
-        
-        print(f"Converted color to ASS format: {ass_color}")
-        
-        # Create ASS color tag
-        color_tag_start = f"{{\\c{ass_color}}}"
-        color_tag_end = "{\\c}"
-        
-        # Replace the HTML tag with ASS color tag
-        processed_text = processed_text[:match.start()] + color_tag_start + content + color_tag_end + processed_text[match.end():]
-        print(f"Processed text with color tags: {processed_text}")
-
-    print(f"\nFinal processed text: {processed_text}")
-else:
-    print("No color tags found in text") 
\ No newline at end of file
+    print(f"Converted color to ASS format: {ass_color}")
+    
+    # Replace the HTML tag with ASS color tag
+    return f"{{\\c{ass_color}}}{content}{{\\c}}"
+
+def test_color_simple():
+    """Convert the sample text's color tags and print each step."""
+    print(f"Original text: {text}")
+
+    # Process color tags
+    if "<font color=" in text:
+        print("Found color tags in text")
+        # Convert every tag in one pass over the text
+        processed_text = FONT_COLOR_RE.sub(replace_font_color, text)
+
+        print(f"\nFinal processed text: {processed_text}")
+    else:
+        print("No color tags found in text")
+
+if __name__ == "__main__":
+    test_color_simple()
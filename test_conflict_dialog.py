@@ -9,18 +9,12 @@ import logging
 project_root = Path(__file__).resolve().parent
 sys.path.insert(0, str(project_root))
 
-# Set up Qt platform plugin path
-if sys.platform.startswith('linux'):
-    potential_plugin_paths = [
-        '/usr/lib/qt/plugins',
-        '/usr/lib/qt6/plugins',
-        '/usr/lib/x86_64-linux-gnu/qt6/plugins',
-        '/usr/local/lib/qt6/plugins'
-    ]
-    for path in potential_plugin_paths:
-        if os.path.exists(path):
-            os.environ['QT_PLUGIN_PATH'] = path
-            break
+# Set up Qt platform plugin path, using the same probe as subtool.py
+from subtool import _find_qt_plugin_path
+if sys.platform.startswith('linux') and not os.environ.get('QT_PLUGIN_PATH'):
+    path = _find_qt_plugin_path()
+    if path:
+        os.environ['QT_PLUGIN_PATH'] = path
 
 # Import our modules
 from src.utils.pattern_guesser import suggest_patterns
@@ -32,7 +26,8 @@ logger = logging.getLogger(__name__)
 
 def test_conflict_resolution():
     """Test the pattern conflict resolution dialog."""
-    app = QApplication(sys.argv)
+    # Reuse the application if one is already running, since Qt allows only one
+    app = QApplication.instance() or QApplication(sys.argv)
     
     # Get pattern suggestions and conflicts
     result = suggest_patterns("test_subs", logger)
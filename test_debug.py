@@ -1,4 +1,3 @@
-from src.utils.ass_converter import create_ass_from_srt
 import logging
 
 # Set up logging
@@ -6,6 +5,9 @@ logging.basicConfig(level=logging.DEBUG)
 
 # Try to convert it
 try:
+    # Imported here so a broken converter import is reported like any other error
+    from src.utils.ass_converter import create_ass_from_srt
+    
     result = create_ass_from_srt(
         'test_subs/test2.srt',
         auto_generate_furigana=False,
@@ -1,9 +1,6 @@
 #!/usr/bin/env python3
-import os
 import re
 import logging
-from pathlib import Path
-import pysubs2
 from src.utils.ass_converter import create_ass_from_srt
 
 # Set up logging
@@ -11,26 +8,37 @@ logging.basicConfig(level=logging.DEBUG,
                    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Pattern for an HTML font color tag and its content
+FONT_COLOR_RE = re.compile(r'<font color="([^"]+)">(.*?)</font>')
+# Pattern for an ASS color tag, with or without braces
+COLOR_TAG_RE = re.compile(r'(?:\\c|\{\\c)&H[0-9A-F]+&(?:\})?')
+
+# Test colors and their expected ASS conversions
+EXPECTED_ASS_COLORS = {
+    "#4B0082": "&H82004B&",  # Indigo
+    "#FF4500": "&H0045FF&",  # OrangeRed
+    "#228B22": "&H228B22&",  # ForestGreen
+    "#9932CC": "&HCC3299&",  # DarkOrchid
+    "#1E90FF": "&HFF901E&",  # DodgerBlue
+    "#FFA500": "&H00A5FF&",  # Orange
+    "#8B4513": "&H13458B&",  # SaddleBrown
+    "#FFD700": "&H00D7FF&",  # Gold
+    "#2F4F4F": "&H4F4F2F&",  # DarkSlateGray
+    "#CD853F": "&H3F85CD&",  # Peru
+}
+
+def html_to_ass_color(html_color):
+    """Convert an HTML #RRGGBB color to an ASS &HBBGGRR& color."""
+    # Parse the RRGGBB digits once and take the channels apart
+    value = int(html_color[1:7], 16)
+    return f"&H{value & 0xFF:02X}{(value >> 8) & 0xFF:02X}{value >> 16:02X}&"
+
 def test_hex_color_conversion():
     """Test hex color conversion from HTML to ASS format."""
-    test_cases = [
-        ("#4B0082", "&H82004B&"),  # Indigo
-        ("#FF4500", "&H0045FF&"),  # OrangeRed
-        ("#228B22", "&H228B22&"),  # ForestGreen
-        ("#9932CC", "&HCC3299&"),  # DarkOrchid
-        ("#1E90FF", "&HFF901E&"),  # DodgerBlue
-        ("#FFA500", "&H00A5FF&"),  # Orange
-        ("#8B4513", "&H13458B&"),  # SaddleBrown
-        ("#FFD700", "&H00D7FF&"),  # Gold
-        ("#2F4F4F", "&H4F4F2F&"),  # DarkSlateGray
-        ("#CD853F", "&H3F85CD&"),  # Peru
-    ]
-    
     logger.info("Testing hex color conversion...")
-    for html_color, expected_ass in test_cases:
+    for html_color, expected_ass in EXPECTED_ASS_COLORS.items():
         # Convert HTML color to ASS color
-        r, g, b = int(html_color[1:3], 16), int(html_color[3:5], 16), int(html_color[5:7], 16)
-        ass_color = f"&H{b:02X}{g:02X}{r:02X}&"
+        ass_color = html_to_ass_color(html_color)
         
         if ass_color == expected_ass:
             logger.info(f"✓ {html_color} -> {ass_color}")
@@ -42,15 +50,14 @@ def test_color_tag_extraction():
     test_text = '<font color="#4B0082">藤色</font>の<font color="#FF4500">朱色</font>'
     logger.info(f"Testing color tag extraction from: {test_text}")
     
-    color_matches = list(re.finditer(r'<font color="([^"]+)">(.*?)</font>', test_text))
+    color_matches = list(FONT_COLOR_RE.finditer(test_text))
     for match in color_matches:
         color = match.group(1)
         content = match.group(2)
         logger.info(f"Found color tag: color={color}, content={content}")
         
         if color.startswith('#'):
-            r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
-            ass_color = f"&H{b:02X}{g:02X}{r:02X}&"
+            ass_color = html_to_ass_color(color)
             logger.info(f"Converted to ASS color: {ass_color}")
 
 def test_ass_conversion():
@@ -71,10 +78,12 @@ def test_ass_conversion():
             ass_content = f.read()
         
         # Check for color tags (both formats)
-        color_tags = re.findall(r'(?:\\c|\{\\c)&H[0-9A-F]+&(?:\})?', ass_content)
+        color_tags = COLOR_TAG_RE.findall(ass_content)
         logger.info(f"Found {len(color_tags)} color tags in ASS file")
         for i, tag in enumerate(color_tags):
             logger.info(f"Color tag {i+1}: {tag}")
+        # Colors used by the tags, e.g. "&H82004B&" from "{\\c&H82004B&}"
+        found_colors = {tag.strip('{}')[2:] for tag in color_tags}
         
         # Check for dialogue lines with color tags
         dialogue_lines = [line for line in ass_content.split('\n') 
@@ -84,15 +93,9 @@ def test_ass_conversion():
             logger.info(f"Dialogue line {i+1}: {line}")
             
         # Verify each color is properly converted
-        test_colors = [
-            "#4B0082", "#FF4500", "#228B22", "#9932CC", "#1E90FF",
-            "#FFA500", "#8B4513", "#FFD700", "#2F4F4F", "#CD853F"
-        ]
-        for color in test_colors:
-            r, g, b = int(color[1:3], 16), int(color[3:5], 16), int(color[5:7], 16)
-            ass_color = f"&H{b:02X}{g:02X}{r:02X}&"
+        for color, ass_color in EXPECTED_ASS_COLORS.items():
             # Check for both formats
-            if f"\\c{ass_color}" in ass_content or f"{{\\c{ass_color}}}" in ass_content:
+            if ass_color in found_colors:
                 logger.info(f"✓ Found correctly converted color: {color} -> {ass_color}")
             else:
                 logger.error(f"✗ Missing or incorrect color conversion: {color} -> {ass_color}")
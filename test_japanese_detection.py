@@ -17,6 +17,16 @@ logging.basicConfig(
 )
 logger = logging.getLogger("JapaneseDetectionTest")
 
+# Pattern for SRT timestamp lines
+_TIMESTAMP_RE = re.compile(r'\d+:\d+:\d+,\d+ --> \d+:\d+:\d+,\d+')
+# Pattern for SRT cue number lines and HTML tags, removed in one pass once
+# timestamps are gone (a stray "<" could otherwise swallow a timestamp's "-->")
+_NUMBER_LINE_OR_TAG_RE = re.compile(r'^\d+$|<[^>]+>', re.MULTILINE)
+# Pattern for whitespace and punctuation skipped when counting characters
+_SKIP_CHAR_RE = re.compile(r'[\s.,:;?!()\[\]{}"\']')
+# Pattern for Hiragana (3040-309F), Katakana (30A0-30FF) and CJK Unified Ideographs (4E00-9FFF)
+_JP_CHAR_RE = re.compile(r'[\u3040-\u30FF\u4E00-\u9FFF]')
+
 # Add src directory to path
 src_path = Path(__file__).resolve().parent / "src"
 sys.path.insert(0, str(src_path))
@@ -51,12 +61,9 @@ def test_file(file_path):
         # If verbose mode, show character counts
         if len(sys.argv) > 2 and sys.argv[2].lower() == 'verbose':
             # Process the content exactly as in the pattern guesser
-            # Remove SRT timestamps, numbers, and common symbols
-            cleaned_content = re.sub(r'\d+:\d+:\d+,\d+ --> \d+:\d+:\d+,\d+', '', content)
-            cleaned_content = re.sub(r'^\d+$', '', cleaned_content, flags=re.MULTILINE)
-            
-            # Remove HTML tags
-            cleaned_content = re.sub(r'<[^>]+>', '', cleaned_content)
+            # Remove SRT timestamps, then cue numbers and HTML tags
+            cleaned_content = _TIMESTAMP_RE.sub('', content)
+            cleaned_content = _NUMBER_LINE_OR_TAG_RE.sub('', cleaned_content)
             
             # Keep only actual text lines
             text_lines = [line for line in cleaned_content.split('\n') 
@@ -68,39 +75,24 @@ def test_file(file_path):
             
             text_content = '\n'.join(text_lines)
             
-            # Count characters
-            total_chars = 0
-            japanese_chars = 0
-            
-            for char in text_content:
-                # Skip whitespace and punctuation
-                if char.isspace() or char in '.,:;?!()[]{}"\'':
-                    continue
-                
-                total_chars += 1
-                
-                # Check for Japanese character ranges
-                # Hiragana (3040-309F), Katakana (30A0-30FF), CJK Unified Ideographs (4E00-9FFF)
-                if '\u3040' <= char <= '\u309F' or '\u30A0' <= char <= '\u30FF' or '\u4E00' <= char <= '\u9FFF':
-                    japanese_chars += 1
+            # Count characters, skipping whitespace and punctuation
+            japanese_found = _JP_CHAR_RE.findall(text_content)
+            total_chars = len(text_content) - len(_SKIP_CHAR_RE.findall(text_content))
+            japanese_chars = len(japanese_found)
             
             japanese_percentage = 0 if total_chars == 0 else (japanese_chars / total_chars) * 100
-            logger.info(f"Total characters: {total_chars}")
-            logger.info(f"Japanese characters: {japanese_chars}")
-            logger.info(f"Japanese percentage: {japanese_percentage:.2f}%")
-            logger.info(f"Decision threshold: >30%")
+            # Report the counts as one log record
+            report = [
+                f"Total characters: {total_chars}",
+                f"Japanese characters: {japanese_chars}",
+                f"Japanese percentage: {japanese_percentage:.2f}%",
+                "Decision threshold: >30%",
+            ]
             
             # Show sample of Japanese characters found
             if japanese_chars > 0:
-                japanese_samples = [
-                    char for char in text_content if 
-                    '\u3040' <= char <= '\u309F' or 
-                    '\u30A0' <= char <= '\u30FF' or 
-                    '\u4E00' <= char <= '\u9FFF'
-                ]
-                sample = ''.join(japanese_samples[:30])
-                if len(sample) > 0:
-                    logger.info(f"Sample Japanese characters: {sample}...")
+                report.append(f"Sample Japanese characters: {''.join(japanese_found[:30])}...")
+            logger.info('\n'.join(report))
     
     except Exception as e:
         logger.error(f"Error analyzing file: {str(e)}")
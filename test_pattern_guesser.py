@@ -5,6 +5,7 @@ import os
 import sys
 from pathlib import Path
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from src.utils.pattern_guesser import suggest_patterns, check_for_japanese, group_files_by_pattern, create_patterns_from_japanese_groups, create_patterns_from_general_groups, detect_episode_patterns
 
 # Configure logging
@@ -29,6 +30,14 @@ except ImportError:
     sys.exit(1)
 
 
+def check_files_for_japanese(files):
+    """Run check_for_japanese on files in parallel threads, in file order."""
+    if not files:
+        return []
+    with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+        return list(executor.map(lambda path: check_for_japanese(path, logger), files))
+
+
 def test_japanese_content_detection():
     """Test the Japanese content detection functionality."""
     test_dir = Path("test_subs")
@@ -41,13 +50,12 @@ def test_japanese_content_detection():
     logger.info("\nTesting Japanese content detection:")
     japanese_files = []
     
-    for filename in test_files:
-        file_path = test_dir / filename
-        if file_path.exists():
-            is_japanese, jp_percentage = check_for_japanese(file_path, logger)
-            logger.info(f"{filename}: {jp_percentage:.2f}% Japanese characters - {'Japanese' if is_japanese else 'Not Japanese'}")
-            if is_japanese:
-                japanese_files.append(filename)
+    existing_files = [filename for filename in test_files if (test_dir / filename).exists()]
+    results = check_files_for_japanese([test_dir / filename for filename in existing_files])
+    for filename, (is_japanese, jp_percentage) in zip(existing_files, results):
+        logger.info(f"{filename}: {jp_percentage:.2f}% Japanese characters - {'Japanese' if is_japanese else 'Not Japanese'}")
+        if is_japanese:
+            japanese_files.append(filename)
     
     return japanese_files
 
@@ -60,23 +68,19 @@ def test_pattern_guesser():
     
     # First detect Japanese files by content
     japanese_files = []
-    for file in files:
-        is_japanese, jp_percentage = check_for_japanese(file, logger)
+    for file, (is_japanese, jp_percentage) in zip(files, check_files_for_japanese(files)):
         if is_japanese:
             japanese_files.append(str(file.name))
     
     logger.info(f"\nFound {len(files)} total files")
-    logger.info(f"Detected {len(japanese_files)} Japanese files by content:")
-    for jp_file in japanese_files:
-        logger.info(f"  - {jp_file}")
+    logger.info('\n'.join([f"Detected {len(japanese_files)} Japanese files by content:"] +
+                          [f"  - {jp_file}" for jp_file in japanese_files]))
     
     # Group files by pattern
     groups = group_files_by_pattern(files, japanese_files, logger)
     logger.info("\nFile groups:")
     for group_name, file_list in groups.items():
-        logger.info(f"\n{group_name}:")
-        for file in file_list:
-            logger.info(f"  - {file}")
+        logger.info('\n'.join([f"\n{group_name}:"] + [f"  - {file}" for file in file_list]))
     
     # Create patterns from Japanese groups
     non_jp_files = [str(f.name) for f in files if str(f.name) not in japanese_files]